@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Buffered asynchronous audit-log ingestion.
+
+logAuditEvent made a synchronous audit_logs insert in the login and signup
+paths; those calls are now fire-and-forget but still insert directly from
+the browser. Nothing produces into this spool yet: it is the server-side
+path for events fed to `serve` (e.g. from a future edge function or batch
+job). Events are accepted into an append-only spool (JSON-lines segments
+on disk, the local queue stand-in) and a background writer flushes
+them as batched multi-row inserts once `batch_size` events are pending or
+`max_delay` seconds have passed. The spool keeps a committed checkpoint, so
+after a restart everything past it is replayed; every event carries its own
+id and inserts ignore duplicates, so replay never double-writes.
+
+Retention works on the monthly partitions created by migration
+20251202030000_audit_logs_partitioning.sql: whole months are dropped
+instead of deleting rows. The Postgres sink creates partitions ahead when
+it starts and again whenever a batch reaches past the covered months, so
+rows only land in audit_logs_default if partition creation fails; the
+next ensure_audit_logs_partitions() call moves them out again.
+
+Sinks: SqliteAuditSink (local stand-in with one table per month) and
+PostgresAuditSink (psycopg, imported lazily).
+
+Usage:
+  python scripts/audit_ingest.py serve < events.jsonl     # accept JSON lines on stdin
+  python scripts/audit_ingest.py flush                    # replay spool into the sink
+  python scripts/audit_ingest.py retention --keep-days 365
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+SPOOL_DIR = Path('.cache/audit_spool')
+DEFAULT_DB = Path('.cache/audit_logs.sqlite')
+SEGMENT_BYTES = 4 * 1024 * 1024
+BATCH_SIZE = 500
+MAX_DELAY_SECONDS = 1.0
+RETENTION_DAYS = 365
+PARTITION_MONTHS_AHEAD = 3
+
+
+class AuditSpool:
+    """Append-only JSON-lines segments with an atomically replaced checkpoint"""
+
+    def __init__(self, directory=SPOOL_DIR, segment_bytes=SEGMENT_BYTES, fsync=True):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = segment_bytes
+        self.fsync = fsync
+        self.lock = threading.Lock()
+        self.checkpoint_path = self.directory / 'checkpoint.json'
+        self._repair_tail()
+        segments = self._segments()
+        self.current = segments[-1] if segments else 0
+
+    def _segment_path(self, index):
+        return self.directory / f'segment-{index:08d}.jsonl'
+
+    def _segments(self):
+        return sorted(int(p.stem.split('-')[1]) for p in self.directory.glob('segment-*.jsonl'))
+
+    def _repair_tail(self):
+        """Drop a torn final line left by a crash mid-append"""
+        segments = self._segments()
+        if not segments:
+            return
+        path = self._segment_path(segments[-1])
+        data = path.read_bytes()
+        if data and not data.endswith(b'\n'):
+            with open(path, 'r+b') as f:
+                f.truncate(data.rfind(b'\n') + 1)
+
+    def checkpoint(self):
+        if not self.checkpoint_path.exists():
+            return (self._segments() or [0])[0], 0
+        saved = json.loads(self.checkpoint_path.read_text(encoding='utf-8'))
+        return saved['segment'], saved['offset']
+
+    def append(self, event):
+        line = (json.dumps(event, separators=(',', ':'), ensure_ascii=False) + '\n').encode('utf-8')
+        with self.lock:
+            path = self._segment_path(self.current)
+            if path.exists() and path.stat().st_size + len(line) > self.segment_bytes:
+                self.current += 1
+                path = self._segment_path(self.current)
+            with open(path, 'ab') as f:
+                f.write(line)
+                if self.fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+
+    def read_pending(self, limit):
+        """Return (events, position) for up to `limit` events after the checkpoint"""
+        with self.lock:
+            segment, offset = self.checkpoint()
+            events = []
+            for index in self._segments():
+                if index < segment:
+                    continue
+                with open(self._segment_path(index), 'rb') as f:
+                    f.seek(offset if index == segment else 0)
+                    while len(events) < limit:
+                        line = f.readline()
+                        if not line.endswith(b'\n'):
+                            break
+                        events.append(json.loads(line))
+                    segment, offset = index, f.tell()
+                if len(events) >= limit:
+                    break
+            return events, (segment, offset)
+
+    def commit(self, position):
+        segment, offset = position
+        tmp = self.checkpoint_path.with_suffix('.tmp')
+        tmp.write_text(json.dumps({'segment': segment, 'offset': offset}), encoding='utf-8')
+        os.replace(tmp, self.checkpoint_path)
+        with self.lock:
+            for index in self._segments():
+                if index < segment:
+                    self._segment_path(index).unlink()
+
+
+def _month_key(created_at):
+    return created_at[:7].replace('-', '_')
+
+
+class SqliteAuditSink:
+    """Local stand-in for the partitioned audit_logs table (one table per month)"""
+
+    def __init__(self, db_path=DEFAULT_DB):
+        import sqlite3
+        if str(db_path) != ':memory:':
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(db_path), check_same_thread=False)
+
+    def _partition(self, month):
+        name = f'audit_logs_{month}'
+        self.conn.execute(f"""CREATE TABLE IF NOT EXISTS {name} (
+            id text PRIMARY KEY, user_id text, event_type text NOT NULL,
+            payload_json text, created_at text NOT NULL)""")
+        self.conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{name}_user_id ON {name}(user_id)")
+        return name
+
+    def partitions(self):
+        rows = self.conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name GLOB 'audit_logs_[0-9]*'").fetchall()
+        return sorted(name for (name,) in rows)
+
+    def insert_many(self, events):
+        by_month = {}
+        for e in events:
+            by_month.setdefault(_month_key(e['created_at']), []).append(
+                (e['id'], e.get('user_id'), e['event_type'], json.dumps(e.get('payload')), e['created_at']))
+        for month, rows in by_month.items():
+            self.conn.executemany(
+                f"INSERT OR IGNORE INTO {self._partition(month)} VALUES (?, ?, ?, ?, ?)", rows)
+        self.conn.commit()
+
+    def drop_partitions_before(self, cutoff):
+        """Drop months that end on or before cutoff"""
+        dropped = 0
+        for name in self.partitions():
+            year, month = map(int, name.rsplit('_', 2)[-2:])
+            month_end = datetime(year + month // 12, month % 12 + 1, 1, tzinfo=timezone.utc)
+            if month_end <= cutoff:
+                self.conn.execute(f"DROP TABLE {name}")
+                dropped += 1
+        self.conn.commit()
+        return dropped
+
+    def count(self):
+        return sum(self.conn.execute(f"SELECT COUNT(*) FROM {name}").fetchone()[0]
+                   for name in self.partitions())
+
+
+class PostgresAuditSink:
+    """Batched inserts into the partitioned public.audit_logs"""
+
+    def __init__(self, dsn, months_ahead=PARTITION_MONTHS_AHEAD):
+        import psycopg
+        self.conn = psycopg.connect(dsn, autocommit=True)
+        self.months_ahead = months_ahead
+        self.covered_until = None
+        self.ensure_partitions()
+
+    def ensure_partitions(self):
+        """Create monthly partitions through months_ahead; returns the number created"""
+        created = self.conn.execute(
+            "SELECT ensure_audit_logs_partitions(months_ahead => %s)", (self.months_ahead,)).fetchone()[0]
+        now = datetime.now(timezone.utc)
+        month = now.month - 1 + self.months_ahead
+        self.covered_until = f'{now.year + month // 12:04d}_{month % 12 + 1:02d}'
+        return created
+
+    def insert_many(self, events):
+        if not events:
+            return
+        if max(_month_key(e['created_at']) for e in events) > self.covered_until:
+            self.ensure_partitions()
+        values = ', '.join(['(%s, %s, %s, %s::jsonb, %s)'] * len(events))
+        params = []
+        for e in events:
+            params.extend([e['id'], e.get('user_id'), e['event_type'], json.dumps(e.get('payload')), e['created_at']])
+        self.conn.execute(
+            f"""INSERT INTO public.audit_logs (id, user_id, event_type, payload_json, created_at)
+                VALUES {values} ON CONFLICT (id, created_at) DO NOTHING""",
+            params,
+        )
+
+    def drop_partitions_before(self, cutoff):
+        self.ensure_partitions()
+        return self.conn.execute(
+            "SELECT drop_audit_logs_partitions_before(%s)", (cutoff,)).fetchone()[0]
+
+
+class AuditWriter:
+    """Accepts events into the spool and flushes them by size or time"""
+
+    def __init__(self, spool, sink, batch_size=BATCH_SIZE, max_delay=MAX_DELAY_SECONDS):
+        self.spool = spool
+        self.sink = sink
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self.pending = 0
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+
+    def log(self, user_id, event_type, payload=None, created_at=None):
+        event = {
+            'id': str(uuid.uuid4()),
+            'user_id': user_id,
+            'event_type': event_type,
+            'payload': payload or {},
+            'created_at': created_at or datetime.now(timezone.utc).isoformat(),
+        }
+        self.spool.append(event)
+        self.pending += 1
+        if self.pending >= self.batch_size:
+            self._wake.set()
+        return event['id']
+
+    def flush(self):
+        """Drain everything after the checkpoint; safe to call on startup to replay"""
+        total = 0
+        with self._flush_lock:
+            while True:
+                events, position = self.spool.read_pending(self.batch_size)
+                if not events:
+                    break
+                self.sink.insert_many(events)
+                self.spool.commit(position)
+                total += len(events)
+            self.pending = 0
+        return total
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.max_delay)
+            self._wake.clear()
+            self.flush()
+
+    def start(self):
+        self.flush()
+        self._thread = threading.Thread(target=self._run, name='audit-writer', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join()
+        return self.flush()
+
+
+def make_sink(args):
+    dsn = args.dsn or os.environ.get('DATABASE_URL')
+    return PostgresAuditSink(dsn) if dsn else SqliteAuditSink(args.db)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--spool', default=str(SPOOL_DIR))
+    parser.add_argument('--db', default=str(DEFAULT_DB), help='SQLite stand-in (used when no DSN is set)')
+    parser.add_argument('--dsn', help='Postgres DSN (default: $DATABASE_URL)')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    serve = sub.add_parser('serve', help='Accept JSON-line events on stdin')
+    serve.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    serve.add_argument('--max-delay', type=float, default=MAX_DELAY_SECONDS)
+    sub.add_parser('flush', help='Replay the spool into the sink')
+    retention = sub.add_parser('retention', help='Drop audit partitions older than the window')
+    retention.add_argument('--keep-days', type=int, default=RETENTION_DAYS)
+
+    args = parser.parse_args()
+    sink = make_sink(args)
+
+    if args.command == 'retention':
+        cutoff = datetime.now(timezone.utc) - timedelta(days=args.keep_days)
+        print(f"✓ Dropped {sink.drop_partitions_before(cutoff)} audit partitions before {cutoff.date()}")
+        return 0
+
+    spool = AuditSpool(args.spool)
+    if args.command == 'flush':
+        print(f"✓ Flushed {AuditWriter(spool, sink).flush()} audit events")
+        return 0
+
+    writer = AuditWriter(spool, sink, args.batch_size, args.max_delay).start()
+    accepted = 0
+    try:
+        for line in sys.stdin:
+            if not line.strip():
+                continue
+            event = json.loads(line)
+            writer.log(event.get('user_id'), event['event_type'], event.get('payload'), event.get('created_at'))
+            accepted += 1
+    finally:
+        writer.stop()
+    print(f"✓ Accepted {accepted} audit events")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
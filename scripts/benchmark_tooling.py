@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the config, locale and patch tooling.
+
+Generates synthetic catalogs at 1x, 10x and 100x the size of
+move2germany_tasks_v1.json (more tasks, cities, subtasks, overlay entries
+and locale keys), times load, overlay merge, validation and locale sync, and
+writes machine-readable results. Patch apply runs the real
+update_housing_subtasks.py against the synthetic catalog in a scratch
+directory, and codemod runs the registered apply_uat_hotfixes.py edits
+through codemod.apply_edits over their target sources repeated `scale`
+times. With --check it compares against a stored baseline and exits
+non-zero when throughput drops or peak memory grows past the thresholds.
+
+Baselines are machine-specific, so the default lives in the gitignored
+.cache/. --check fails when the baseline file is missing; record one first
+with --update-baseline, or point --baseline at a committed file (e.g. one
+kept per CI runner) so a fresh checkout still has something to compare to.
+
+Usage:
+  python scripts/benchmark_tooling.py [--scales 1,10,100] [--check] [--update-baseline]
+"""
+import argparse
+import contextlib
+import copy
+import io
+import json
+import os
+import platform
+import runpy
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import codemod
+from config_tools import (
+    BASE_LOCALE, TASKS_PATH, dump_json, load_json, locale_path, merge_overlay,
+    overlay_path, sync_locale, validate_catalog,
+)
+
+DEFAULT_SCALES = (1, 10, 100)
+DEFAULT_REPEATS = 5
+RESULTS_PATH = Path('.cache/bench/results.json')
+BASELINE_PATH = Path('.cache/bench/baseline.json')
+SCRIPTS_DIR = Path(__file__).resolve().parent
+PATCH_SCRIPT = SCRIPTS_DIR / 'update_housing_subtasks.py'
+MAX_SLOWDOWN = 0.25
+MAX_MEMORY_GROWTH = 0.25
+
+
+def _suffix(value, replica):
+    return value if replica == 0 else f'{value}--{replica}'
+
+
+def generate_catalog(scale, base=None, overlay=None, locales=None):
+    """Replicate the real catalog `scale` times with consistent ids and references"""
+    base = base or load_json(TASKS_PATH)
+    overlay = overlay if overlay is not None else load_json(overlay_path('en'))
+    locales = locales or {code: load_json(locale_path(code)) for code in (BASE_LOCALE, 'de')}
+
+    cities = list(base['cities'])
+    tasks, overlay_entries = [], []
+    for replica in range(scale):
+        replica_cities = [] if replica == 0 else [
+            {'id': _suffix(c['id'], replica), 'name': f"{c['name']} {replica}"} for c in base['cities']
+        ]
+        cities.extend(replica_cities)
+        for task in base['tasks']:
+            clone = copy.deepcopy(task)
+            clone['id'] = _suffix(task['id'], replica)
+            clone['dependencies'] = [_suffix(d, replica) for d in task.get('dependencies', [])]
+            clone['cityScope'] = task.get('cityScope', []) + [c['id'] for c in replica_cities]
+            for subtask in clone.get('subtasks') or []:
+                if subtask.get('linkedTaskId'):
+                    subtask['linkedTaskId'] = _suffix(subtask['linkedTaskId'], replica)
+            tasks.append(clone)
+        for entry in overlay:
+            overlay_entries.append({**copy.deepcopy(entry), 'id': _suffix(entry['id'], replica)})
+
+    locale_base = {f'bench{r}': copy.deepcopy(locales[BASE_LOCALE]) for r in range(scale)}
+    # Target locale keeps roughly its real coverage so sync has work to do
+    locale_target = {f'bench{r}': copy.deepcopy(locales['de']) for r in range(scale)}
+
+    catalog = {**base, 'cities': cities, 'tasks': tasks}
+    return {
+        'catalog_text': dump_json(catalog),
+        'overlay': overlay_entries,
+        'locale_base': locale_base,
+        'locale_target': locale_target,
+        'task_count': len(tasks),
+    }
+
+
+def hotfix_sources(scale, root='.'):
+    """(source, edits) for every file the UAT hotfix edits target, each repeated `scale` times"""
+    import apply_uat_hotfixes  # noqa: F401  (registers the edits)
+    edits = codemod.registered_edits()
+    sources = []
+    for rel_path in codemod.source_files(root):
+        file_edits = [e for e in edits if e.matches_path(rel_path)]
+        if file_edits:
+            text = (Path(root) / rel_path).read_text(encoding='utf-8')
+            sources.append(('\n'.join([text] * scale), file_edits))
+    return sources
+
+
+def apply_hotfixes(sources):
+    return [codemod.apply_edits(src, edits) for src, edits in sources]
+
+
+def run_patch_script(workdir):
+    """Run update_housing_subtasks.py as a script against workdir/config/"""
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            runpy.run_path(str(PATCH_SCRIPT), run_name='__main__')
+    finally:
+        os.chdir(cwd)
+
+
+def operations(data, workdir):
+    """name -> (setup, fn, items) where fn(setup()) is the timed body"""
+    text = data['catalog_text']
+    config_path = Path(workdir) / TASKS_PATH
+
+    def write_catalog():
+        config_path.parent.mkdir(parents=True, exist_ok=True)
+        config_path.write_text(text, encoding='utf-8')
+        return workdir
+
+    return {
+        'load': (lambda: text, json.loads, data['task_count']),
+        'patch_apply': (write_catalog, run_patch_script, data['task_count']),
+        'codemod': (lambda: data['hotfix_sources'], apply_hotfixes,
+                    sum(len(src) for src, _ in data['hotfix_sources'])),
+        'overlay_merge': (lambda: json.loads(text)['tasks'],
+                          lambda tasks: merge_overlay(tasks, data['overlay']), data['task_count']),
+        'validate': (lambda: json.loads(text), validate_catalog, data['task_count']),
+        'locale_sync': (lambda: copy.deepcopy(data['locale_target']),
+                        lambda target: sync_locale(data['locale_base'], target),
+                        len(json.dumps(data['locale_base']))),
+    }
+
+
+def measure(setup, fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        arg = setup()
+        start = time.perf_counter()
+        fn(arg)
+        timings.append(time.perf_counter() - start)
+
+    arg = setup()
+    tracemalloc.start()
+    fn(arg)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(timings), peak
+
+
+def run_suite(scales=DEFAULT_SCALES, repeats=DEFAULT_REPEATS):
+    results = {}
+    for scale in scales:
+        data = generate_catalog(scale)
+        data['hotfix_sources'] = hotfix_sources(scale)
+        with tempfile.TemporaryDirectory(prefix='m2g-bench-') as workdir:
+            for name, (setup, fn, items) in operations(data, workdir).items():
+                seconds, peak = measure(setup, fn, repeats)
+                results[f'{name}@{scale}x'] = {
+                    'seconds': round(seconds, 6),
+                    'throughput': round(items / seconds, 1) if seconds else None,
+                    'peak_kib': round(peak / 1024, 1),
+                    'items': items,
+                }
+                print(f"  {name:<14} {scale:>4}x  {seconds * 1000:9.2f} ms  "
+                      f"{peak / 1024:10.1f} KiB  ({data['task_count']} tasks)")
+    return results
+
+
+def compare(results, baseline, max_slowdown=MAX_SLOWDOWN, max_memory_growth=MAX_MEMORY_GROWTH):
+    """Return human-readable regressions versus the baseline"""
+    regressions = []
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if not previous:
+            continue
+        if previous.get('throughput') and current['throughput'] is not None and \
+                current['throughput'] < previous['throughput'] * (1 - max_slowdown):
+            regressions.append(f"{key}: throughput {current['throughput']:.0f}/s "
+                               f"< baseline {previous['throughput']:.0f}/s")
+        if current['peak_kib'] > previous['peak_kib'] * (1 + max_memory_growth):
+            regressions.append(f"{key}: peak memory {current['peak_kib']:.0f} KiB "
+                               f"> baseline {previous['peak_kib']:.0f} KiB")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', default=','.join(map(str, DEFAULT_SCALES)))
+    parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS)
+    parser.add_argument('--output', default=str(RESULTS_PATH))
+    parser.add_argument('--baseline', default=str(BASELINE_PATH),
+                        help='Baseline JSON (default .cache/bench/baseline.json; may be a committed path)')
+    parser.add_argument('--check', action='store_true', help='Fail on regression versus the baseline')
+    parser.add_argument('--update-baseline', action='store_true')
+    parser.add_argument('--max-slowdown', type=float, default=MAX_SLOWDOWN)
+    parser.add_argument('--max-memory-growth', type=float, default=MAX_MEMORY_GROWTH)
+    args = parser.parse_args()
+
+    baseline_path = Path(args.baseline)
+    if args.check and not args.update_baseline and not baseline_path.exists():
+        print(f"✗ No baseline at {baseline_path}; run with --update-baseline first", file=sys.stderr)
+        return 1
+
+    scales = [int(s) for s in args.scales.split(',') if s]
+    print(f"Benchmarking tooling at scales {scales} ({args.repeats} repeats)")
+    results = run_suite(scales, args.repeats)
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': results,
+    }, indent=2), encoding='utf-8')
+    print(f"✓ Results written to {output}")
+
+    if args.update_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(results, indent=2) + '\n', encoding='utf-8')
+        print(f"✓ Baseline updated: {baseline_path}")
+        return 0
+
+    if args.check:
+        regressions = compare(results, json.loads(baseline_path.read_text(encoding='utf-8')),
+                              args.max_slowdown, args.max_memory_growth)
+        for line in regressions:
+            print(f"✗ {line}", file=sys.stderr)
+        if regressions:
+            return 1
+        print("✓ No regressions versus baseline")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Retrieval-result and answer cache for the chat edge function.
+
+Repeat questions ("How do I do Anmeldung?") should skip both the embedding
+call and the match_documents vector search. Entries are keyed on the
+normalized query text plus locale, hold the top-k document ids and the
+generated answer, and are evicted by TTL and LRU. Every entry records the
+corpus version it was built against (documents_version, bumped by a trigger
+on public.documents). Each lookup reads the current version through an
+injected version provider, so re-ingestion invalidates the cache
+automatically.
+
+The local stand-in store is SQLite; the key format is stable so the edge
+function can share it through any KV backend. The version is read from
+Postgres via --dsn / $DATABASE_URL (psycopg, imported lazily).
+
+Usage:
+  python scripts/chat_cache.py stats
+  python scripts/chat_cache.py sync          # drop entries if documents changed
+  python scripts/chat_cache.py invalidate
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+import unicodedata
+from pathlib import Path
+
+DEFAULT_DB = Path('.cache/chat_cache.sqlite')
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 10000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS chat_cache (
+    cache_key text PRIMARY KEY,
+    locale text NOT NULL,
+    query text NOT NULL,
+    document_ids text NOT NULL,
+    answer text,
+    corpus_version integer NOT NULL,
+    created_at real NOT NULL,
+    last_hit_at real NOT NULL,
+    hits integer NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_chat_cache_last_hit ON chat_cache(last_hit_at);
+CREATE TABLE IF NOT EXISTS chat_cache_meta (
+    key text PRIMARY KEY,
+    value text NOT NULL
+);
+"""
+
+_PUNCT_RE = re.compile(r'[\s?!.,;:¿¡"\'`]+')
+
+
+def normalize_query(query):
+    """Case-, width- and punctuation-insensitive form of a user question"""
+    text = unicodedata.normalize('NFKC', query).casefold()
+    return _PUNCT_RE.sub(' ', text).strip()
+
+
+def cache_key(query, locale):
+    normalized = normalize_query(query)
+    return hashlib.sha256(f"{locale or 'en'}\0{normalized}".encode('utf-8')).hexdigest()
+
+
+def documents_version(conn):
+    """Read the corpus version written by the documents_version trigger"""
+    row = conn.execute("SELECT version FROM documents_version").fetchone()
+    return int(row[0]) if row else 0
+
+
+def postgres_version_provider(dsn):
+    """Version provider reading documents_version over one autocommit connection"""
+    import psycopg
+    conn = psycopg.connect(dsn, autocommit=True)
+    return lambda: documents_version(conn)
+
+
+class ChatCache:
+    """
+    TTL + LRU cache of retrieval results and answers.
+
+    version_provider() returns the current documents_version; when given,
+    every lookup syncs against it before reading an entry.
+    """
+
+    def __init__(self, db_path=DEFAULT_DB, ttl_seconds=DEFAULT_TTL_SECONDS,
+                 max_entries=DEFAULT_MAX_ENTRIES, clock=time.time, version_provider=None):
+        if str(db_path) != ':memory:':
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(db_path))
+        self.conn.executescript(SCHEMA)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.clock = clock
+        self.version_provider = version_provider
+
+    def close(self):
+        self.conn.close()
+
+    @property
+    def corpus_version(self):
+        row = self.conn.execute(
+            "SELECT value FROM chat_cache_meta WHERE key = 'corpus_version'").fetchone()
+        return int(row[0]) if row else 0
+
+    def sync_corpus_version(self, version):
+        """Drop every entry if the documents table changed since the last sync"""
+        if version == self.corpus_version:
+            return False
+        self.conn.execute("DELETE FROM chat_cache")
+        self.conn.execute(
+            "INSERT OR REPLACE INTO chat_cache_meta (key, value) VALUES ('corpus_version', ?)",
+            (str(version),),
+        )
+        self.conn.commit()
+        return True
+
+    def get(self, query, locale):
+        if self.version_provider is not None:
+            self.sync_corpus_version(self.version_provider())
+        key = cache_key(query, locale)
+        row = self.conn.execute(
+            "SELECT document_ids, answer, corpus_version, created_at FROM chat_cache WHERE cache_key = ?",
+            (key,),
+        ).fetchone()
+        if not row:
+            return None
+
+        document_ids, answer, version, created_at = row
+        now = self.clock()
+        if version != self.corpus_version or now - created_at > self.ttl_seconds:
+            self.conn.execute("DELETE FROM chat_cache WHERE cache_key = ?", (key,))
+            self.conn.commit()
+            return None
+
+        self.conn.execute(
+            "UPDATE chat_cache SET last_hit_at = ?, hits = hits + 1 WHERE cache_key = ?", (now, key))
+        self.conn.commit()
+        return {'document_ids': json.loads(document_ids), 'answer': answer}
+
+    def put(self, query, locale, document_ids, answer=None):
+        now = self.clock()
+        self.conn.execute(
+            """INSERT OR REPLACE INTO chat_cache
+               (cache_key, locale, query, document_ids, answer, corpus_version, created_at, last_hit_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+            (cache_key(query, locale), locale or 'en', normalize_query(query),
+             json.dumps(list(document_ids)), answer, self.corpus_version, now, now),
+        )
+        self._evict(now)
+        self.conn.commit()
+
+    def _evict(self, now):
+        self.conn.execute("DELETE FROM chat_cache WHERE created_at < ?", (now - self.ttl_seconds,))
+        overflow = self.conn.execute("SELECT COUNT(*) FROM chat_cache").fetchone()[0] - self.max_entries
+        if overflow > 0:
+            self.conn.execute(
+                """DELETE FROM chat_cache WHERE cache_key IN (
+                       SELECT cache_key FROM chat_cache ORDER BY last_hit_at LIMIT ?)""",
+                (overflow,),
+            )
+
+    def answer(self, query, locale, embed, search, generate, fetch):
+        """
+        Serve a chat request through the cache.
+
+        embed(query) -> vector and search(vector) -> [{'id': ...}, ...] are
+        only called on a miss. A cached retrieval result without an answer
+        loads its documents with fetch(ids) -> [{'id': ...}, ...] instead;
+        generate(query, documents, locale) -> str then fills in the answer.
+        Returns (answer, hit) where hit is 'answer', 'retrieval' or None.
+        """
+        cached = self.get(query, locale)
+        if cached and cached['answer'] is not None:
+            return cached['answer'], 'answer'
+
+        if cached:
+            documents = fetch(cached['document_ids'])
+            hit = 'retrieval'
+        else:
+            documents = search(embed(query))
+            hit = None
+        text = generate(query, documents, locale)
+        self.put(query, locale, [doc['id'] for doc in documents], text)
+        return text, hit
+
+    def stats(self):
+        count, hits = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(hits), 0) FROM chat_cache").fetchone()
+        return {'entries': count, 'hits': hits, 'corpus_version': self.corpus_version}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', default=str(DEFAULT_DB))
+    parser.add_argument('--dsn', help='Postgres DSN for documents_version (default: $DATABASE_URL)')
+    parser.add_argument('command', choices=['stats', 'sync', 'invalidate'])
+    args = parser.parse_args()
+
+    cache = ChatCache(args.db)
+    try:
+        if args.command == 'stats':
+            print(json.dumps(cache.stats(), indent=2))
+        elif args.command == 'sync':
+            dsn = args.dsn or os.environ.get('DATABASE_URL')
+            if not dsn:
+                print("✗ sync needs --dsn or $DATABASE_URL", file=sys.stderr)
+                return 1
+            version = postgres_version_provider(dsn)()
+            dropped = cache.sync_corpus_version(version)
+            print(f"✓ Corpus version {version}{' (cache cleared)' if dropped else ''}")
+        else:
+            cache.sync_corpus_version(cache.corpus_version + 1)
+            print("✓ Chat cache invalidated")
+    finally:
+        cache.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+City registry and compact city-set encoding.
+
+Cities used to be listed by hand (restore_config.py hardcoded five) and every
+task carries its cities as a string array in cityScope, while
+housing_providers.json already names 20 cities in cityIds. This registry
+(config/cities_v1.json) gives each city a stable integer index: indexes are
+append-only and retired cities keep theirs, so compiled bitsets never shift.
+
+In the compiled config (m2g bundle) every cityScope / cityIds array gains a
+`citySet` next to it, encoded as whichever is shorter:
+
+  {"all": true}              wildcard scope ("*", every active city)
+  {"mask": "<hex>"}          bitset, bit i = city index i
+  {"ranges": [[lo, hi]]}     inclusive index ranges, for large contiguous sets
+
+The string arrays are still written (with "*" expanded) so the existing
+loader keeps working unchanged.
+
+Usage:
+  python scripts/city_registry.py seed                 # add cities referenced in config/
+  python scripts/city_registry.py import cities.csv    # columns: id,name
+  python scripts/city_registry.py list
+  python scripts/city_registry.py retire CITY_ID
+"""
+import argparse
+import csv
+import json
+import re
+import sys
+from pathlib import Path
+
+from config_tools import CONFIG_DIR, TASKS_PATH, WILDCARD_CITY, load_json, save_json
+
+REGISTRY_PATH = CONFIG_DIR / 'cities_v1.json'
+HOUSING_PROVIDERS_PATH = CONFIG_DIR / 'housing_providers.json'
+ACTION_BLOCKS_PATH = CONFIG_DIR / 'action_blocks_v1.json'
+CITY_ID_PATTERN = re.compile(r'^[a-z0-9][a-z0-9_-]*$')
+
+
+class UnknownCityError(ValueError):
+    def __init__(self, city_ids, where=None):
+        self.city_ids = sorted(city_ids)
+        self.where = where
+        ids = ', '.join(f"'{city_id}'" for city_id in self.city_ids)
+        super().__init__(f"unknown city {ids}{f' in {where}' if where else ''} "
+                         f"(not in {REGISTRY_PATH.name}; run city_registry.py seed)")
+
+
+class CityRegistry:
+    def __init__(self, cities=None):
+        self.cities = []
+        self.by_id = {}
+        for city in cities or []:
+            self.by_id[city['id']] = city
+            self.cities.append(city)
+
+    @classmethod
+    def load(cls, path=REGISTRY_PATH):
+        path = Path(path)
+        return cls(load_json(path)['cities'] if path.exists() else [])
+
+    def save(self, path=REGISTRY_PATH):
+        save_json(path, {'cities': self.cities})
+
+    def active(self):
+        return [c for c in self.cities if not c.get('retired')]
+
+    def index(self, city_id):
+        if city_id not in self.by_id:
+            raise UnknownCityError([city_id])
+        return self.by_id[city_id]['index']
+
+    def add(self, city_id, name=None):
+        """Register a city (idempotent); returns (index, created)"""
+        if not CITY_ID_PATTERN.match(city_id):
+            raise ValueError(f"invalid city id '{city_id}'")
+        if city_id in self.by_id:
+            city = self.by_id[city_id]
+            if name and city['name'] != name:
+                city['name'] = name
+            city.pop('retired', None)
+            return city['index'], False
+        city = {'id': city_id, 'name': name or city_id.replace('_', ' ').title(), 'index': len(self.cities)}
+        self.cities.append(city)
+        self.by_id[city_id] = city
+        return city['index'], True
+
+    def retire(self, city_id):
+        self.by_id[city_id]['retired'] = True
+
+    def expand(self, city_ids):
+        """String ids with the wildcard expanded to every active city"""
+        if WILDCARD_CITY in city_ids:
+            return [c['id'] for c in self.active()]
+        return list(city_ids)
+
+    def encode(self, city_ids):
+        if WILDCARD_CITY in city_ids:
+            return {'all': True}
+        unknown = {city_id for city_id in city_ids if city_id not in self.by_id}
+        if unknown:
+            raise UnknownCityError(unknown)
+        indexes = sorted({self.index(city_id) for city_id in city_ids})
+        mask = 0
+        for i in indexes:
+            mask |= 1 << i
+        as_mask = {'mask': format(mask, 'x')}
+        as_ranges = {'ranges': to_ranges(indexes)}
+        return min(as_mask, as_ranges, key=lambda e: len(json.dumps(e, separators=(',', ':'))))
+
+    def decode(self, encoded):
+        """City ids in an encoded set (active cities only for the wildcard)"""
+        if encoded.get('all'):
+            return [c['id'] for c in self.active()]
+        return [c['id'] for c in self.cities if contains(encoded, c['index'])]
+
+
+def to_ranges(indexes):
+    ranges = []
+    for i in indexes:
+        if ranges and ranges[-1][1] == i - 1:
+            ranges[-1][1] = i
+        else:
+            ranges.append([i, i])
+    return ranges
+
+
+def contains(encoded, index):
+    if encoded.get('all'):
+        return True
+    if 'mask' in encoded:
+        return bool(int(encoded['mask'], 16) >> index & 1)
+    return any(lo <= index <= hi for lo, hi in encoded['ranges'])
+
+
+def referenced_cities(config_dir=CONFIG_DIR):
+    """(id, name) pairs referenced anywhere in config/, in first-seen order"""
+    config = load_json(Path(config_dir) / TASKS_PATH.name)
+    seen = {c['id']: c['name'] for c in config['cities']}
+    for task in config['tasks']:
+        for city_id in task.get('cityScope', []):
+            seen.setdefault(city_id, None)
+    for provider in load_json(Path(config_dir) / HOUSING_PROVIDERS_PATH.name):
+        for city_id in provider.get('cityIds', []):
+            seen.setdefault(city_id, None)
+    for block in load_json(Path(config_dir) / ACTION_BLOCKS_PATH.name)['actionBlocks'].values():
+        for link in block.get('actionLinks', []):
+            for city_id in link.get('cityScope', []):
+                seen.setdefault(city_id, None)
+    seen.pop(WILDCARD_CITY, None)
+    return list(seen.items())
+
+
+def task_cities(registry, tasks):
+    """Registry entries for the cities the given tasks reference (for the config root)"""
+    used = {city_id for task in tasks for city_id in task.get('cityScope', [])}
+    return [{'id': c['id'], 'name': c['name']} for c in registry.active()
+            if WILDCARD_CITY in used or c['id'] in used]
+
+
+def _compile_scope(registry, item, key, where):
+    if key in item:
+        scope = item[key]
+        try:
+            encoded = registry.encode(scope)
+        except UnknownCityError as e:
+            raise UnknownCityError(e.city_ids, f'{where}.{key}') from None
+        item = {**item, key: registry.expand(scope), 'citySet': encoded}
+    return item
+
+
+def compile_config(config, registry):
+    """Task config with citySet added to every task and indexes on the cities list"""
+    unknown = {city['id'] for city in config['cities'] if city['id'] not in registry.by_id}
+    if unknown:
+        raise UnknownCityError(unknown, 'cities')
+    cities = [{**city, 'index': registry.index(city['id'])} for city in config['cities']]
+    tasks = [_compile_scope(registry, task, 'cityScope', f"task '{task['id']}'") for task in config['tasks']]
+    return {**config, 'cities': cities, 'tasks': tasks}
+
+
+def compile_housing_providers(providers, registry):
+    return [_compile_scope(registry, provider, 'cityIds', f"housing provider '{provider['id']}'")
+            for provider in providers]
+
+
+def compile_action_blocks(config, registry):
+    blocks = {}
+    for task_id, block in config['actionBlocks'].items():
+        if 'actionLinks' in block:
+            block = {**block, 'actionLinks': [_compile_scope(registry, link, 'cityScope',
+                                                             f"action block '{task_id}' link {i}")
+                                              for i, link in enumerate(block['actionLinks'])]}
+        blocks[task_id] = block
+    return {**config, 'actionBlocks': blocks}
+
+
+def import_csv(registry, path):
+    """Add cities from a CSV with id,name columns; returns the ids created"""
+    created = []
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            _, is_new = registry.add(row['id'].strip().lower(), (row.get('name') or '').strip() or None)
+            if is_new:
+                created.append(row['id'])
+    return created
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--registry', default=str(REGISTRY_PATH))
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('seed', help='Register every city referenced in config/')
+    imp = sub.add_parser('import', help='Register cities from a CSV (id,name)')
+    imp.add_argument('csv')
+    sub.add_parser('list', help='Print the registry')
+    retire = sub.add_parser('retire', help='Retire a city (its index is never reused)')
+    retire.add_argument('city_id')
+    args = parser.parse_args()
+
+    registry = CityRegistry.load(args.registry)
+    if args.command == 'list':
+        for city in registry.cities:
+            print(f"{city['index']:>4}  {city['id']:<24} {city['name']}{'  (retired)' if city.get('retired') else ''}")
+        return 0
+
+    if args.command == 'seed':
+        created = [city_id for city_id, name in referenced_cities() if registry.add(city_id, name)[1]]
+    elif args.command == 'import':
+        try:
+            created = import_csv(registry, args.csv)
+        except ValueError as e:
+            print(f"✗ {e}", file=sys.stderr)
+            return 1
+    else:
+        if args.city_id not in registry.by_id:
+            print(f"✗ Unknown city '{args.city_id}'", file=sys.stderr)
+            return 1
+        registry.retire(args.city_id)
+        created = []
+
+    registry.save(args.registry)
+    print(f"✓ {len(created)} cities added, {len(registry.active())} active in {args.registry}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
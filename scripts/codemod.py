@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+Token-level codemod runner for TS/TSX sources.
+
+The UAT hotfix scripts used to patch files by matching multi-hundred
+character literal blocks (or giant escaped regexes), rereading and rewriting
+the file once per fix and silently skipping when whitespace differed. Here
+each file is tokenized once, every registered edit is matched as an anchored
+sequence of significant tokens (whitespace and comments are ignored), and
+all matches are spliced in a single pass. Every edit reports exactly one
+outcome, and files are processed in parallel.
+
+Outcomes:
+  applied          find matched (expected number of times) and was replaced
+  already_applied  skip_if matched, nothing to do
+  no_match         find did not match
+  ambiguous        find matched more often than expected
+  overlap          match overlaps another edit's match in the same file
+
+Usage:
+  python scripts/apply_uat_hotfixes.py            # registers edits and calls run()
+  python scripts/codemod.py --list src            # print token stats for a tree
+"""
+import argparse
+import json
+import re
+import sys
+import textwrap
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from fnmatch import fnmatch
+from pathlib import Path
+
+from instrumentation import phase, tracer
+
+SOURCE_SUFFIXES = ('.ts', '.tsx')
+
+APPLIED = 'applied'
+ALREADY_APPLIED = 'already_applied'
+NO_MATCH = 'no_match'
+AMBIGUOUS = 'ambiguous'
+OVERLAP = 'overlap'
+
+_PUNCTUATORS = sorted([
+    '>>>=', '...', '===', '!==', '**=', '<<=', '>>=', '&&=', '||=', '??=',
+    '=>', '?.', '??', '==', '!=', '<=', '>=', '&&', '||', '++', '--', '+=',
+    '-=', '*=', '/=', '%=', '&=', '|=', '^=', '**', '<<',
+], key=len, reverse=True)
+_IDENT_RE = re.compile(r'[A-Za-z_$À-￿][\w$À-￿]*')
+_NUMBER_RE = re.compile(r'\d[\w.]*')
+_WS_RE = re.compile(r'\s+')
+_REGEX_FLAGS_RE = re.compile(r'[A-Za-z]*')
+# A `/` after one of these starts a regex literal rather than a division.
+# `<` is left out so JSX closing tags (`</div>`) stay punctuation.
+_REGEX_KEYWORDS = frozenset([
+    'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void',
+    'throw', 'case', 'do', 'else', 'yield', 'await',
+])
+
+
+@dataclass(frozen=True)
+class Token:
+    kind: str
+    text: str
+    start: int
+    end: int
+
+
+def _scan_quoted(src, i):
+    """End index of a '...' or "..." string; stops at newline so JSX text can't run away"""
+    quote = src[i]
+    i += 1
+    while i < len(src):
+        ch = src[i]
+        if ch == '\\':
+            i += 2
+            continue
+        if ch == quote:
+            return i + 1
+        if ch == '\n':
+            return i
+        i += 1
+    return i
+
+
+def _scan_template(src, i):
+    """End index of a template literal, including nested ${ ... } expressions"""
+    i += 1
+    while i < len(src):
+        ch = src[i]
+        if ch == '\\':
+            i += 2
+            continue
+        if ch == '`':
+            return i + 1
+        if src.startswith('${', i):
+            i += 2
+            depth = 1
+            while i < len(src) and depth:
+                c = src[i]
+                if c in '\'"':
+                    i = _scan_quoted(src, i)
+                    continue
+                if c == '`':
+                    i = _scan_template(src, i)
+                    continue
+                if c == '{':
+                    depth += 1
+                elif c == '}':
+                    depth -= 1
+                i += 1
+            continue
+        i += 1
+    return i
+
+
+def _regex_allowed(prev):
+    """Whether a `/` after significant token `prev` starts a regex literal"""
+    if prev is None:
+        return True
+    if prev.kind == 'punct':
+        return prev.text not in (')', ']', '}', '<', '++', '--')
+    return prev.kind == 'ident' and prev.text in _REGEX_KEYWORDS
+
+
+def _scan_regex(src, i):
+    """End index of a regex literal starting at i, or None if the line has no closing `/`"""
+    i += 1
+    in_class = False
+    while i < len(src):
+        ch = src[i]
+        if ch == '\\':
+            i += 2
+            continue
+        if ch == '\n':
+            return None
+        if ch == '[':
+            in_class = True
+        elif ch == ']':
+            in_class = False
+        elif ch == '/' and not in_class:
+            return _REGEX_FLAGS_RE.match(src, i + 1).end()
+        i += 1
+    return None
+
+
+def tokenize(src):
+    """Split TS/TSX source into tokens; every character belongs to exactly one token"""
+    tokens = []
+    prev = None
+    i = 0
+    n = len(src)
+    while i < n:
+        ch = src[i]
+        if ch.isspace():
+            end = _WS_RE.match(src, i).end()
+            kind = 'ws'
+        elif src.startswith('//', i):
+            end = src.find('\n', i)
+            end = n if end == -1 else end
+            kind = 'comment'
+        elif src.startswith('/*', i):
+            end = src.find('*/', i + 2)
+            end = n if end == -1 else end + 2
+            kind = 'comment'
+        elif ch in '\'"':
+            end = _scan_quoted(src, i)
+            kind = 'string'
+        elif ch == '`':
+            end = _scan_template(src, i)
+            kind = 'template'
+        elif ch == '/' and _regex_allowed(prev) and _scan_regex(src, i) is not None:
+            end = _scan_regex(src, i)
+            kind = 'regex'
+        elif ch.isdigit():
+            end = _NUMBER_RE.match(src, i).end()
+            kind = 'number'
+        else:
+            m = _IDENT_RE.match(src, i)
+            if m:
+                end = m.end()
+                kind = 'ident'
+            else:
+                end = i + 1
+                for p in _PUNCTUATORS:
+                    if src.startswith(p, i):
+                        end = i + len(p)
+                        break
+                kind = 'punct'
+        token = Token(kind, src[i:end], i, end)
+        tokens.append(token)
+        if kind not in ('ws', 'comment'):
+            prev = token
+        i = end
+    return tokens
+
+
+def significant(tokens):
+    return [t for t in tokens if t.kind not in ('ws', 'comment')]
+
+
+@dataclass(frozen=True)
+class Edit:
+    """
+    Replace the token sequence `find` in files matching `path` (a glob
+    relative to the repo root) with `replace`. `skip_if` is a token pattern
+    whose presence means the edit has already been applied. `count` is the
+    number of matches expected per file (None = replace every match).
+    """
+    name: str
+    path: str
+    find: str
+    replace: str
+    skip_if: str = None
+    count: int = 1
+
+    def matches_path(self, rel_path):
+        return fnmatch(rel_path, self.path)
+
+
+_REGISTRY = []
+
+
+def register(name, path, find, replace, skip_if=None, count=1):
+    edit = Edit(name, path, textwrap.dedent(find).strip(), textwrap.dedent(replace).strip(), skip_if, count)
+    _REGISTRY.append(edit)
+    return edit
+
+
+def registered_edits():
+    return list(_REGISTRY)
+
+
+def find_matches(sig_tokens, pattern):
+    """Start indexes (into sig_tokens) of every anchored occurrence of pattern"""
+    texts = [t.text for t in significant(tokenize(pattern))]
+    if not texts:
+        return [], 0
+    first, length = texts[0], len(texts)
+    hits = []
+    for i in range(len(sig_tokens) - length + 1):
+        if sig_tokens[i].text == first and all(
+                sig_tokens[i + k].text == texts[k] for k in range(1, length)):
+            hits.append(i)
+    return hits, length
+
+
+def _reindent(replacement, src, start):
+    """Indent continuation lines of the replacement to the column of the match"""
+    line_start = src.rfind('\n', 0, start) + 1
+    indent = re.match(r'[ \t]*', src[line_start:start]).group(0)
+    lines = replacement.split('\n')
+    return '\n'.join([lines[0]] + [indent + line if line else line for line in lines[1:]])
+
+
+def apply_edits(src, edits):
+    """Apply every edit to one source string in a single splice; returns (new_src, results)"""
+    sig = significant(tokenize(src))
+    results = []
+    spans = []
+
+    for edit in edits:
+        if edit.skip_if and find_matches(sig, edit.skip_if)[0]:
+            results.append((edit.name, ALREADY_APPLIED, 0))
+            continue
+        hits, length = find_matches(sig, edit.find)
+        if not hits:
+            results.append((edit.name, NO_MATCH, 0))
+            continue
+        if edit.count is not None and len(hits) > edit.count:
+            results.append((edit.name, AMBIGUOUS, len(hits)))
+            continue
+
+        edit_spans = [(sig[h].start, sig[h + length - 1].end, edit) for h in hits]
+        if any(s < e2 and s2 < e for s, e, _ in edit_spans for s2, e2, _ in spans):
+            results.append((edit.name, OVERLAP, len(hits)))
+            continue
+        spans.extend(edit_spans)
+        results.append((edit.name, APPLIED, len(hits)))
+
+    if not spans:
+        return src, results
+
+    out = []
+    cursor = 0
+    for start, end, edit in sorted(spans, key=lambda s: s[0]):
+        out.append(src[cursor:start])
+        out.append(_reindent(edit.replace, src, start))
+        cursor = end
+    out.append(src[cursor:])
+    return ''.join(out), results
+
+
+def _process_file(job):
+    root, rel_path, edits, dry_run = job
+    path = Path(root) / rel_path
+    src = path.read_text(encoding='utf-8')
+    with phase('codemod', rel_path):
+        new_src, results = apply_edits(src, edits)
+    changed = new_src != src
+    if changed and not dry_run:
+        path.write_text(new_src, encoding='utf-8')
+    return rel_path, changed, results
+
+
+def source_files(root, subdir='src'):
+    base = Path(root) / subdir
+    return sorted(
+        p.relative_to(root).as_posix()
+        for p in base.rglob('*')
+        if p.suffix in SOURCE_SUFFIXES and 'node_modules' not in p.parts
+    )
+
+
+def run(edits=None, root='.', subdir='src', dry_run=False, workers=None):
+    """
+    Apply edits across the tree. Returns {edit_name: {file: (outcome, hits)}};
+    an edit that matched no file at all is reported under the key None.
+    """
+    edits = registered_edits() if edits is None else edits
+    jobs = []
+    for rel_path in source_files(root, subdir):
+        file_edits = [e for e in edits if e.matches_path(rel_path)]
+        if file_edits:
+            jobs.append((str(root), rel_path, file_edits, dry_run))
+
+    report = {edit.name: {} for edit in edits}
+    changed_files = []
+    # Worker processes don't share the tracer, so traced runs stay in-process
+    if tracer.enabled:
+        workers = 1
+    if len(jobs) > 1 and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            outcomes = list(pool.map(_process_file, jobs))
+    else:
+        outcomes = [_process_file(job) for job in jobs]
+
+    for rel_path, changed, results in outcomes:
+        if changed:
+            changed_files.append(rel_path)
+        for name, outcome, hits in results:
+            report[name][rel_path] = (outcome, hits)
+
+    for name, files in report.items():
+        if not files:
+            files[None] = (NO_MATCH, 0)
+    return report, changed_files
+
+
+def print_report(report, changed_files, dry_run=False):
+    """Human summary; returns True when every edit applied or was already applied"""
+    ok = True
+    for name, files in report.items():
+        outcomes = {outcome for outcome, _ in files.values()}
+        # An edit targeting a glob only needs to land somewhere
+        success = outcomes & {APPLIED, ALREADY_APPLIED}
+        symbol = '✓' if success else '✗'
+        ok = ok and bool(success) and not outcomes & {AMBIGUOUS, OVERLAP}
+        for rel_path, (outcome, hits) in sorted(files.items(), key=lambda f: f[0] or ''):
+            if outcome in (APPLIED, ALREADY_APPLIED) or not success:
+                where = rel_path or '(no file matched path)'
+                suffix = f" x{hits}" if hits > 1 else ''
+                print(f"{symbol} {name}: {outcome}{suffix} in {where}")
+    verb = 'Would modify' if dry_run else 'Modified'
+    print(f"\n{verb} {len(changed_files)} file(s)")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('subdir', nargs='?', default='src')
+    parser.add_argument('--list', action='store_true', help='Print token counts per file')
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    files = source_files('.', args.subdir)
+    stats = {}
+    for rel_path in files:
+        tokens = tokenize(Path(rel_path).read_text(encoding='utf-8'))
+        stats[rel_path] = len(significant(tokens))
+    if args.json:
+        # Keep stdout a single JSON document for piping
+        print(json.dumps(stats, indent=2))
+        return 0
+    if args.list:
+        for rel_path, count in stats.items():
+            print(f"{count:8d}  {rel_path}")
+    print(f"✓ Tokenized {len(files)} files")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Community feed maintenance and keyset pagination helpers.
+
+getTopics used to embed a community_replies(count) aggregate and load every
+topic with no limit. Topics now carry denormalized reply_count and
+last_activity_at (see migration 20251202020000_community_feed_keyset.sql),
+and the feed is paged by (created_at, id) so each page costs the same no
+matter how large the forum gets.
+
+The counts are maintained by the update_topic_reply_count trigger on
+community_replies (inserts, soft deletes and hard deletes). `refresh` is a
+drift repair: it recounts only the topics whose stored reply_count differs
+from their live replies, which also catches changes made while the trigger
+was missing or disabled; `--rebuild` recounts every topic. It runs against
+Postgres via --dsn / $DATABASE_URL (psycopg, imported lazily), or a local
+SQLite stand-in with the same columns.
+
+Usage:
+  python scripts/community_feed.py refresh [--rebuild]
+  python scripts/community_feed.py page <city_id> [--module ID] [--cursor C] [--limit N]
+"""
+import argparse
+import base64
+import json
+import os
+import sqlite3
+import sys
+from pathlib import Path
+
+DEFAULT_DB = Path('.cache/community.sqlite')
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS community_topics (
+    id text PRIMARY KEY,
+    city_id text,
+    module_id text,
+    title text NOT NULL,
+    body text NOT NULL,
+    created_by text,
+    status text DEFAULT 'active',
+    created_at text NOT NULL,
+    updated_at text,
+    deleted_at text,
+    is_deleted integer DEFAULT 0,
+    reply_count integer DEFAULT 0,
+    last_activity_at text
+);
+CREATE INDEX IF NOT EXISTS idx_community_topics_feed
+    ON community_topics(city_id, created_at DESC, id DESC);
+CREATE TABLE IF NOT EXISTS community_replies (
+    id text PRIMARY KEY,
+    topic_id text,
+    created_by text,
+    body text NOT NULL,
+    created_at text NOT NULL,
+    updated_at text NOT NULL,
+    deleted_at text,
+    is_deleted integer DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_community_replies_topic_created
+    ON community_replies(topic_id, created_at, id);
+"""
+
+_LIVE_REPLIES = """
+    FROM community_replies r
+    WHERE r.topic_id = community_topics.id AND NOT r.is_deleted AND r.deleted_at IS NULL
+"""
+_LIVE_COUNT = f"(SELECT COUNT(*) {_LIVE_REPLIES})"
+
+_RECOUNT_SQL = f"""
+UPDATE community_topics SET
+    reply_count = {_LIVE_COUNT},
+    last_activity_at = {{greatest}}(created_at, COALESCE((SELECT MAX(r.created_at) {_LIVE_REPLIES}), created_at))
+"""
+
+
+class Database:
+    """Thin DB-API wrapper so the same SQL runs on SQLite and psycopg"""
+
+    def __init__(self, conn, is_postgres):
+        self.conn = conn
+        self.is_postgres = is_postgres
+
+    def execute(self, sql, params=()):
+        if self.is_postgres:
+            sql = sql.replace('?', '%s').replace('{greatest}', 'GREATEST')
+        else:
+            sql = sql.replace('{greatest}', 'MAX')
+        cur = self.conn.cursor()
+        cur.execute(sql, params)
+        return cur
+
+    def commit(self):
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+def connect(db_path=DEFAULT_DB, dsn=None):
+    if dsn:
+        import psycopg
+        return Database(psycopg.connect(dsn), is_postgres=True)
+    if str(db_path) != ':memory:':
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(db_path))
+    conn.executescript(SCHEMA)
+    return Database(conn, is_postgres=False)
+
+
+def rebuild_counts(conn):
+    """Recount every topic from scratch; returns the number of topics"""
+    updated = conn.execute(_RECOUNT_SQL).rowcount
+    conn.commit()
+    return updated
+
+
+def refresh_counts(conn):
+    """Recount the topics whose stored reply_count disagrees with their live replies"""
+    updated = conn.execute(f"{_RECOUNT_SQL} WHERE COALESCE(reply_count, -1) <> {_LIVE_COUNT}").rowcount
+    conn.commit()
+    return updated
+
+
+def encode_cursor(created_at, topic_id):
+    raw = json.dumps([created_at, topic_id], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    padded = cursor + '=' * (-len(cursor) % 4)
+    created_at, topic_id = json.loads(base64.urlsafe_b64decode(padded))
+    return created_at, topic_id
+
+
+def keyset_clause(cursor):
+    """SQL fragment + params for rows strictly after `cursor` in (created_at, id) DESC order"""
+    if not cursor:
+        return '', ()
+    return ' AND (created_at, id) < (?, ?)', decode_cursor(cursor)
+
+
+def postgrest_filter(cursor):
+    """Equivalent `.or()` filter for the supabase-js client (no row-value comparison there)"""
+    created_at, topic_id = decode_cursor(cursor)
+    return f"created_at.lt.{created_at},and(created_at.eq.{created_at},id.lt.{topic_id})"
+
+
+def feed_page(conn, city_id, module_id=None, cursor=None, limit=DEFAULT_PAGE_SIZE):
+    """Return (topics, next_cursor); next_cursor is None on the last page"""
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    sql = """SELECT id, city_id, module_id, title, created_by, status, created_at,
+                    reply_count, last_activity_at
+             FROM community_topics
+             WHERE city_id = ? AND deleted_at IS NULL"""
+    params = [city_id]
+    if module_id:
+        sql += " AND module_id = ?"
+        params.append(module_id)
+    clause, cursor_params = keyset_clause(cursor)
+    sql += clause + " ORDER BY created_at DESC, id DESC LIMIT ?"
+    params.extend(cursor_params)
+    params.append(limit + 1)
+
+    cur = conn.execute(sql, params)
+    columns = [c[0] for c in cur.description]
+    rows = [dict(zip(columns, row)) for row in cur.fetchall()]
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]['created_at'], rows[-1]['id'])
+    return rows, next_cursor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', default=str(DEFAULT_DB), help='SQLite stand-in (used when no DSN is set)')
+    parser.add_argument('--dsn', help='Postgres DSN (default: $DATABASE_URL)')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    refresh = sub.add_parser('refresh', help='Repair reply_count / last_activity_at drift')
+    refresh.add_argument('--rebuild', action='store_true', help='Recount every topic')
+
+    page = sub.add_parser('page', help='Print one feed page as JSON')
+    page.add_argument('city_id')
+    page.add_argument('--module')
+    page.add_argument('--cursor')
+    page.add_argument('--limit', type=int, default=DEFAULT_PAGE_SIZE)
+
+    args = parser.parse_args()
+    conn = connect(args.db, args.dsn or os.environ.get('DATABASE_URL'))
+    try:
+        if args.command == 'refresh':
+            if args.rebuild:
+                print(f"✓ Rebuilt reply counts for {rebuild_counts(conn)} topics")
+            else:
+                print(f"✓ Repaired reply counts for {refresh_counts(conn)} topics")
+        else:
+            topics, next_cursor = feed_page(conn, args.city_id, args.module, args.cursor, args.limit)
+            print(json.dumps({'topics': topics, 'nextCursor': next_cursor}, indent=2, ensure_ascii=False))
+    finally:
+        conn.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the task config and locale tooling.
+
+Centralizes the paths and the load / overlay-merge / validate / locale-sync
+operations that the one-off scripts used to reimplement, so benchmarks and
+the CLI exercise exactly the same code.
+"""
+import json
+from pathlib import Path
+
+from instrumentation import phase
+
+CONFIG_DIR = Path('config')
+LOCALES_DIR = Path('src/locales')
+TASKS_PATH = CONFIG_DIR / 'move2germany_tasks_v1.json'
+BASE_LOCALE = 'en'
+OVERLAY_LOCALES = ('en', 'ar', 'de')
+UI_LOCALES = ('en', 'tr', 'ar', 'de')
+WILDCARD_CITY = '*'
+
+
+def overlay_path(locale, config_dir=CONFIG_DIR):
+    return Path(config_dir) / f'move2germany_tasks_{locale}_v1.json'
+
+
+def locale_path(locale, locales_dir=LOCALES_DIR):
+    return Path(locales_dir) / f'{locale}.json'
+
+
+def load_json(path):
+    with phase('parse', path), open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def dump_json(data):
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+
+def save_json(path, data):
+    with phase('serialize', path):
+        text = dump_json(data)
+    with phase('write', path), open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def merge_overlay(tasks, overlay):
+    """Mirror of configLoader.getTasks: text fields only, field-level fallback to base"""
+    overlay_map = {entry['id']: entry for entry in overlay}
+    merged = []
+    for base in tasks:
+        entry = overlay_map.get(base['id'])
+        if not entry:
+            merged.append(base)
+            continue
+        task = dict(base)
+        for field in ('title', 'description', 'cityNote'):
+            if entry.get(field):
+                task[field] = entry[field]
+        if base.get('subtasks'):
+            sub_titles = {s['id']: s.get('title') for s in entry.get('subtasks') or []}
+            task['subtasks'] = [
+                {**s, 'title': sub_titles.get(s['id']) or s['title']} for s in base['subtasks']
+            ]
+        merged.append(task)
+    return merged
+
+
+def validate_catalog(config):
+    """
+    Return a list of (severity, message). Dangling references are errors;
+    duplicate task ids are warnings because the loader keeps the first one.
+    """
+    issues = []
+    for key in ('cities', 'timeWindows', 'modules', 'tasks'):
+        if not isinstance(config.get(key), list):
+            issues.append(('error', f"missing root key '{key}'"))
+    if any(severity == 'error' for severity, _ in issues):
+        return issues
+
+    cities = {c['id'] for c in config['cities']}
+    time_windows = {t['id'] for t in config['timeWindows']}
+    modules = {m['id'] for m in config['modules']}
+    task_ids = set()
+    duplicates = set()
+    for task in config['tasks']:
+        if task['id'] in task_ids:
+            duplicates.add(task['id'])
+        task_ids.add(task['id'])
+
+    for task_id in sorted(duplicates):
+        issues.append(('warning', f"duplicate task id '{task_id}'"))
+
+    for task in config['tasks']:
+        tid = task['id']
+        if task.get('timeWindow') not in time_windows:
+            issues.append(('error', f"{tid}: unknown timeWindow '{task.get('timeWindow')}'"))
+        if task.get('module') not in modules:
+            issues.append(('error', f"{tid}: unknown module '{task.get('module')}'"))
+        for city in task.get('cityScope', []):
+            if city not in cities and city != WILDCARD_CITY:
+                issues.append(('error', f"{tid}: unknown city '{city}' in cityScope"))
+        for dep in task.get('dependencies', []):
+            if dep not in task_ids:
+                issues.append(('error', f"{tid}: unknown dependency '{dep}'"))
+        seen_subtasks = set()
+        for subtask in task.get('subtasks') or []:
+            if subtask['id'] in seen_subtasks:
+                issues.append(('warning', f"{tid}: duplicate subtask id '{subtask['id']}'"))
+            seen_subtasks.add(subtask['id'])
+            if subtask.get('type') == 'linked_task' and subtask.get('linkedTaskId') not in task_ids:
+                issues.append(('error', f"{tid}/{subtask['id']}: unknown linkedTaskId '{subtask.get('linkedTaskId')}'"))
+    return issues
+
+
+def flatten_keys(data, prefix=''):
+    flat = {}
+    for key, value in data.items():
+        if isinstance(value, dict):
+            flat.update(flatten_keys(value, f'{prefix}{key}.'))
+        else:
+            flat[f'{prefix}{key}'] = value
+    return flat
+
+
+def set_key(data, dotted_key, value):
+    """Set a dotted key; returns False if a parent is already a plain string"""
+    node = data
+    *parents, leaf = dotted_key.split('.')
+    for part in parents:
+        node = node.setdefault(part, {})
+        if not isinstance(node, dict):
+            return False
+    node[leaf] = value
+    return True
+
+
+def sync_locale(base, target, fill=None):
+    """
+    Add every key present in `base` but missing from `target`. Missing
+    values come from fill(key, base_value), defaulting to the base text.
+    Returns (added, conflicts); conflicts are keys whose parent is a string
+    in `target` (e.g. de.json `tasks.importance`) and are left untouched.
+    """
+    existing = flatten_keys(target)
+    added, conflicts = [], []
+    for key, value in flatten_keys(base).items():
+        if key in existing:
+            continue
+        if set_key(target, key, fill(key, value) if fill else value):
+            added.append(key)
+        else:
+            conflicts.append(key)
+    return added, conflicts
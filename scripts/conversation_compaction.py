@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Conversation history compaction for ai_messages.
+
+sendMessage used to load the whole ai_messages history for every prompt, so
+prompt size, latency and token cost grew with conversation length. This job
+periodically folds older turns into a rolling summary stored on the
+ai_conversations row and marks those messages as compacted, leaving exactly
+the last --keep-last turns uncompacted. src/lib/ai.ts loads the summary plus
+every uncompacted message, so no turn falls between the two.
+
+The summarizer is pluggable; the default is extractive and needs no model
+call. Run it against Supabase Postgres via --dsn / $DATABASE_URL (psycopg,
+imported lazily); without a DSN a local SQLite stand-in with the same
+columns is used for dry runs.
+
+Usage:
+  python scripts/conversation_compaction.py [--dsn DSN | --db PATH] [--keep-last 10]
+"""
+import argparse
+import os
+import re
+import sqlite3
+import sys
+from pathlib import Path
+
+DEFAULT_DB = Path('.cache/ai_history.sqlite')
+KEEP_LAST_TURNS = 10
+MIN_BATCH = 10
+MAX_SUMMARY_CHARS = 2000
+MAX_POINT_CHARS = 160
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ai_conversations (
+    id text PRIMARY KEY,
+    user_id text NOT NULL,
+    started_at text,
+    ended_at text,
+    summary text,
+    summary_message_count integer DEFAULT 0,
+    summarized_until text
+);
+CREATE TABLE IF NOT EXISTS ai_messages (
+    id text PRIMARY KEY,
+    conversation_id text NOT NULL,
+    role text NOT NULL,
+    content text NOT NULL,
+    created_at text NOT NULL,
+    compacted integer DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_ai_messages_conversation_window
+    ON ai_messages(conversation_id, compacted, created_at);
+"""
+
+_SENTENCE_RE = re.compile(r'(?<=[.!?])\s+')
+
+
+class Database:
+    """Thin DB-API wrapper so the same SQL runs on SQLite and psycopg"""
+
+    def __init__(self, conn, is_postgres):
+        self.conn = conn
+        self.is_postgres = is_postgres
+
+    def _q(self, sql):
+        return sql.replace('?', '%s') if self.is_postgres else sql
+
+    def execute(self, sql, params=()):
+        cur = self.conn.cursor()
+        cur.execute(self._q(sql), params)
+        return cur
+
+    def executemany(self, sql, rows):
+        cur = self.conn.cursor()
+        cur.executemany(self._q(sql), rows)
+        return cur
+
+    def commit(self):
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+def connect(db_path=DEFAULT_DB, dsn=None):
+    if dsn:
+        import psycopg
+        return Database(psycopg.connect(dsn), is_postgres=True)
+    if str(db_path) != ':memory:':
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(db_path))
+    conn.executescript(SCHEMA)
+    return Database(conn, is_postgres=False)
+
+
+def extractive_summary(previous_summary, messages, max_chars=MAX_SUMMARY_CHARS):
+    """Keep the first sentence of each turn, newest points win when over budget"""
+    points = previous_summary.splitlines() if previous_summary else []
+    for role, content in messages:
+        first = _SENTENCE_RE.split(content.strip(), maxsplit=1)[0]
+        if len(first) > MAX_POINT_CHARS:
+            first = first[:MAX_POINT_CHARS - 1] + '…'
+        points.append(f"- {'User' if role == 'user' else 'Assistant'}: {first}")
+
+    while points and len('\n'.join(points)) > max_chars:
+        points.pop(0)
+    return '\n'.join(points)
+
+
+def compact_conversation(conn, conversation_id, keep_last=KEEP_LAST_TURNS,
+                         min_batch=MIN_BATCH, summarize=extractive_summary):
+    """Fold everything but the last `keep_last` messages into the rolling summary"""
+    rows = conn.execute(
+        """SELECT id, role, content, created_at FROM ai_messages
+           WHERE conversation_id = ? AND NOT compacted
+           ORDER BY created_at, id""",
+        (conversation_id,),
+    ).fetchall()
+
+    older = rows[:-keep_last] if keep_last else rows
+    if len(older) < min_batch:
+        return 0
+
+    summary, count = conn.execute(
+        "SELECT summary, COALESCE(summary_message_count, 0) FROM ai_conversations WHERE id = ?",
+        (conversation_id,),
+    ).fetchone()
+    summary = summarize(summary, [(role, content) for _, role, content, _ in older])
+
+    conn.execute(
+        """UPDATE ai_conversations
+           SET summary = ?, summary_message_count = ?, summarized_until = ?
+           WHERE id = ?""",
+        (summary, count + len(older), older[-1][3], conversation_id),
+    )
+    conn.executemany(
+        "UPDATE ai_messages SET compacted = ? WHERE id = ?", [(True, row[0]) for row in older])
+    conn.commit()
+    return len(older)
+
+
+def compact_all(conn, keep_last=KEEP_LAST_TURNS, min_batch=MIN_BATCH, summarize=extractive_summary):
+    """Compact every conversation that has accumulated at least one full batch"""
+    candidates = conn.execute(
+        """SELECT conversation_id FROM ai_messages WHERE NOT compacted
+           GROUP BY conversation_id HAVING COUNT(*) >= ?""",
+        (keep_last + min_batch,),
+    ).fetchall()
+
+    total = 0
+    for (conversation_id,) in candidates:
+        total += compact_conversation(conn, conversation_id, keep_last, min_batch, summarize)
+    return len(candidates), total
+
+
+def windowed_history(conn, conversation_id):
+    """Summary plus every uncompacted turn, oldest first (what getConversationHistory loads)"""
+    row = conn.execute(
+        "SELECT summary FROM ai_conversations WHERE id = ?", (conversation_id,)).fetchone()
+    messages = conn.execute(
+        """SELECT role, content FROM ai_messages
+           WHERE conversation_id = ? AND NOT compacted
+           ORDER BY created_at, id""",
+        (conversation_id,),
+    ).fetchall()
+    return {
+        'summary': row[0] if row else None,
+        'messages': [{'role': role, 'content': content} for role, content in messages],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', default=str(DEFAULT_DB), help='SQLite stand-in (used when no DSN is set)')
+    parser.add_argument('--dsn', help='Postgres DSN (default: $DATABASE_URL)')
+    parser.add_argument('--keep-last', type=int, default=KEEP_LAST_TURNS)
+    parser.add_argument('--min-batch', type=int, default=MIN_BATCH)
+    args = parser.parse_args()
+
+    conn = connect(args.db, args.dsn or os.environ.get('DATABASE_URL'))
+    try:
+        conversations, messages = compact_all(conn, args.keep_last, args.min_batch)
+    finally:
+        conn.close()
+    print(f"✓ Compacted {messages} messages across {conversations} conversations")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Streaming per-user data export for GDPR requests and account deletion.
+
+exportUserData in src/lib/auth.ts loads whole tables into the browser and
+deleteAccount only soft-deletes, so there was no way to hand a user their
+complete data. This engine walks every user-owned table with keyset
+pagination on (owner, id) and streams each page straight into a deflate-
+compressed zip as JSON lines; the user's document blobs are then fetched
+concurrently through a bounded window and copied into the archive as they
+arrive. Memory stays bounded by one page plus --blob-workers spooled
+blobs, whatever the size of the history.
+
+Archive layout:
+  manifest.json              user, timestamp, row counts, blob index
+  tables/<table>.jsonl       one row per line
+  documents/<sha-or-id>      each stored object once (content-addressed
+                             blobs are shared between documents rows)
+
+Bulk mode claims requests from export_requests (migration
+20251202050000_data_export_requests.sql) with FOR UPDATE SKIP LOCKED and
+processes them on --workers threads, each with its own connection.
+
+Rows come from Postgres via --dsn / $DATABASE_URL (psycopg, imported
+lazily; a local Postgres works as the stand-in) or a SQLite file with the
+same tables. Blobs come from the document_store object backends.
+
+Usage:
+  python scripts/data_export.py export USER_ID [--out .cache/exports]
+  python scripts/data_export.py enqueue USER_ID [USER_ID ...]
+  python scripts/data_export.py bulk [--workers 4]
+"""
+import argparse
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import uuid
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+
+from document_store import CHUNK_SIZE, SPOOL_MEMORY_BYTES, LocalObjects, SupabaseObjects
+
+DEFAULT_DB = Path('.cache/data_export.sqlite')
+DEFAULT_OUT = Path('.cache/exports')
+PAGE_SIZE = 500
+BLOB_WORKERS = 4
+BULK_WORKERS = 4
+
+# (archive name, table, owner column, parent). Rows are owned by the user
+# directly, or through `parent` = (table, owner column): ai_messages are paged
+# per conversation so every page is served by the (conversation_id, id) index.
+EXPORT_TABLES = (
+    ('users', 'users', 'id', None),
+    ('user_tasks', 'user_tasks', 'user_id', None),
+    ('user_subtasks', 'user_subtasks', 'user_id', None),
+    ('notes', 'notes', 'user_id', None),
+    ('documents', 'documents', 'user_id', None),
+    ('user_task_documents', 'user_task_documents', 'user_id', None),
+    ('ai_conversations', 'ai_conversations', 'user_id', None),
+    ('ai_messages', 'ai_messages', 'conversation_id', ('ai_conversations', 'user_id')),
+    ('user_points', 'user_points', 'user_id', None),
+    ('community_topics', 'community_topics', 'created_by', None),
+    ('community_replies', 'community_replies', 'created_by', None),
+    ('community_messages', 'community_messages', 'created_by', None),
+    ('community_reports', 'community_reports', 'reporter_id', None),
+    ('audit_logs', 'audit_logs', 'user_id', None),
+)
+
+QUEUE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS export_requests (
+    id text PRIMARY KEY,
+    user_id text NOT NULL,
+    status text NOT NULL DEFAULT 'pending',
+    requested_at text NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    started_at text,
+    finished_at text,
+    archive_path text,
+    error text
+);
+"""
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, uuid.UUID)):
+        return str(value)
+    if isinstance(value, (bytes, memoryview)):
+        return bytes(value).hex()
+    raise TypeError(f'not JSON serializable: {type(value).__name__}')
+
+
+class Database:
+    """Thin DB-API wrapper so the same SQL runs on SQLite and psycopg"""
+
+    def __init__(self, dsn=None, db_path=DEFAULT_DB):
+        self.is_postgres = bool(dsn)
+        if dsn:
+            import psycopg
+            self.conn = psycopg.connect(dsn)
+        else:
+            self.conn = sqlite3.connect(str(db_path), timeout=30, isolation_level=None)
+
+    def execute(self, sql, params=()):
+        cur = self.conn.cursor()
+        cur.execute(sql.replace('?', '%s') if self.is_postgres else sql, params)
+        return cur
+
+    def close(self):
+        self.conn.close()
+
+
+def iter_table_pages(db, table, owner, owner_id, page_size=PAGE_SIZE, columns='*'):
+    """Yield (columns, rows) pages of one table for one owner via keyset pagination on (owner, id)"""
+    base = f"SELECT {columns} FROM {table} WHERE {owner} = ?"
+    # No lower bound on the first page: ids are uuid in Postgres, so there is no
+    # untyped "before everything" literal. Later pages continue from the last id
+    # as returned by the driver, which keeps its type.
+    after = None
+    key_index = None
+    while True:
+        if after is None:
+            cur = db.execute(f"{base} ORDER BY id LIMIT ?", (owner_id, page_size))
+        else:
+            cur = db.execute(f"{base} AND id > ? ORDER BY id LIMIT ?", (owner_id, after, page_size))
+        rows = cur.fetchall()
+        if not rows:
+            return
+        names = [c[0] for c in cur.description]
+        if key_index is None:
+            key_index = names.index('id')
+        yield names, rows
+        if len(rows) < page_size:
+            return
+        after = rows[-1][key_index]
+
+
+def iter_owned_pages(db, table, owner, parent, user_id, page_size=PAGE_SIZE):
+    """Pages of `table` owned by the user, walking parent ids first for indirectly owned tables"""
+    if parent is None:
+        yield from iter_table_pages(db, table, owner, user_id, page_size)
+        return
+    parent_table, parent_owner = parent
+    for _, parent_rows in iter_table_pages(db, parent_table, parent_owner, user_id, page_size, columns='id'):
+        for (parent_id,) in parent_rows:
+            yield from iter_table_pages(db, table, owner, parent_id, page_size)
+
+
+def _fetch_blob(objects, key):
+    """Copy one stored object into a spool file (disk-backed beyond SPOOL_MEMORY_BYTES)"""
+    spool = tempfile.SpooledTemporaryFile(SPOOL_MEMORY_BYTES)
+    with objects.open(key) as source:
+        shutil.copyfileobj(source, spool, CHUNK_SIZE)
+    spool.seek(0)
+    return spool
+
+
+def _write_blobs(archive, objects, blobs, workers, missing):
+    """Fetch blobs concurrently, keeping at most `workers` downloads in flight"""
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        in_flight = []
+        pending = iter(blobs.items())
+        while True:
+            for name, (document_id, key) in pending:
+                in_flight.append((name, document_id, pool.submit(_fetch_blob, objects, key)))
+                if len(in_flight) >= workers:
+                    break
+            if not in_flight:
+                return
+            # Zip entries are written one at a time, in submission order
+            name, document_id, future = in_flight.pop(0)
+            try:
+                spool = future.result()
+            except Exception as e:
+                missing.append({'id': document_id, 'archive_path': name, 'error': str(e)})
+                continue
+            with spool, archive.open(name, 'w', force_zip64=True) as dest:
+                shutil.copyfileobj(spool, dest, CHUNK_SIZE)
+
+
+def _blob_name(document):
+    return f"documents/{document.get('content_sha256') or document['id']}"
+
+
+def export_user(db, objects, user_id, out_dir=DEFAULT_OUT, page_size=PAGE_SIZE, blob_workers=BLOB_WORKERS):
+    """Write <out_dir>/<user_id>.zip and return its manifest"""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    final_path = out_dir / f'{user_id}.zip'
+    tmp_path = out_dir / f'.{user_id}.{os.getpid()}.{threading.get_ident()}.zip.part'
+    manifest = {
+        'user_id': user_id,
+        'generated_at': datetime.now(timezone.utc).isoformat(),
+        'tables': {},
+        'documents': [],
+        'missing_documents': [],
+    }
+
+    blobs = {}
+    with zipfile.ZipFile(tmp_path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, table, owner, parent in EXPORT_TABLES:
+            count = 0
+            with archive.open(f'tables/{name}.jsonl', 'w', force_zip64=True) as dest:
+                for columns, rows in iter_owned_pages(db, table, owner, parent, user_id, page_size):
+                    for row in rows:
+                        record = dict(zip(columns, row))
+                        dest.write((json.dumps(record, default=_json_default, ensure_ascii=False) + '\n')
+                                   .encode('utf-8'))
+                        if name == 'documents':
+                            blob = _blob_name(record)
+                            blobs.setdefault(blob, (str(record['id']), record['storage_key']))
+                            manifest['documents'].append({'id': record['id'], 'file_name': record['file_name'],
+                                                          'archive_path': blob})
+                    count += len(rows)
+            manifest['tables'][name] = count
+        _write_blobs(archive, objects, blobs, blob_workers, manifest['missing_documents'])
+        archive.writestr('manifest.json', json.dumps(manifest, indent=2, ensure_ascii=False, default=_json_default))
+
+    os.replace(tmp_path, final_path)
+    manifest['archive_path'] = str(final_path)
+    return manifest
+
+
+def enqueue(db, user_ids):
+    if not db.is_postgres:
+        db.conn.executescript(QUEUE_SCHEMA)
+    ids = []
+    for user_id in user_ids:
+        request_id = str(uuid.uuid4())
+        db.execute("INSERT INTO export_requests (id, user_id) VALUES (?, ?)", (request_id, user_id))
+        ids.append(request_id)
+    db.conn.commit()
+    return ids
+
+
+def claim_request(db):
+    """Atomically move the oldest pending request to running; returns (id, user_id) or None"""
+    now = datetime.now(timezone.utc).isoformat()
+    if db.is_postgres:
+        row = db.execute(
+            """UPDATE export_requests SET status = 'running', started_at = now()
+               WHERE id = (SELECT id FROM export_requests WHERE status = 'pending'
+                           ORDER BY requested_at FOR UPDATE SKIP LOCKED LIMIT 1)
+               RETURNING id, user_id""").fetchone()
+        db.conn.commit()
+        return row
+    db.execute("BEGIN IMMEDIATE")
+    try:
+        row = db.execute("SELECT id, user_id FROM export_requests WHERE status = 'pending' "
+                         "ORDER BY requested_at, id LIMIT 1").fetchone()
+        if row:
+            db.execute("UPDATE export_requests SET status = 'running', started_at = ? WHERE id = ?", (now, row[0]))
+        db.execute("COMMIT")
+    except Exception:
+        db.execute("ROLLBACK")
+        raise
+    return row
+
+
+def finish_request(db, request_id, archive_path=None, error=None):
+    db.execute("UPDATE export_requests SET status = ?, finished_at = ?, archive_path = ?, error = ? WHERE id = ?",
+               ('failed' if error else 'done', datetime.now(timezone.utc).isoformat(), archive_path, error,
+                request_id))
+    if db.is_postgres:
+        db.conn.commit()
+
+
+def run_bulk(connect, objects, out_dir=DEFAULT_OUT, workers=BULK_WORKERS, page_size=PAGE_SIZE,
+             blob_workers=BLOB_WORKERS):
+    """Drain the export queue on `workers` threads; returns (done, failed)"""
+    totals = {'done': 0, 'failed': 0}
+    lock = threading.Lock()
+
+    def worker():
+        db = connect()
+        try:
+            while True:
+                claimed = claim_request(db)
+                if not claimed:
+                    return
+                request_id, user_id = str(claimed[0]), str(claimed[1])
+                try:
+                    manifest = export_user(db, objects, user_id, out_dir, page_size, blob_workers)
+                    finish_request(db, request_id, manifest['archive_path'])
+                    outcome = 'done'
+                except Exception as e:
+                    if db.is_postgres:
+                        db.conn.rollback()
+                    finish_request(db, request_id, error=str(e))
+                    outcome = 'failed'
+                with lock:
+                    totals[outcome] += 1
+        finally:
+            db.close()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for future in [pool.submit(worker) for _ in range(workers)]:
+            future.result()
+    return totals['done'], totals['failed']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', default=str(DEFAULT_DB), help='SQLite stand-in (used when no DSN is set)')
+    parser.add_argument('--dsn', help='Postgres DSN (default: $DATABASE_URL)')
+    parser.add_argument('--objects', default='.cache/document_objects', help='Local object directory stand-in')
+    parser.add_argument('--bucket', action='store_true', help='Read blobs from the Supabase documents bucket')
+    parser.add_argument('--out', default=str(DEFAULT_OUT))
+    parser.add_argument('--page-size', type=int, default=PAGE_SIZE)
+    parser.add_argument('--blob-workers', type=int, default=BLOB_WORKERS)
+    sub = parser.add_subparsers(dest='command', required=True)
+    exp = sub.add_parser('export', help='Export one user now')
+    exp.add_argument('user_id')
+    enq = sub.add_parser('enqueue', help='Queue export requests')
+    enq.add_argument('user_ids', nargs='+')
+    bulk = sub.add_parser('bulk', help='Process the export queue')
+    bulk.add_argument('--workers', type=int, default=BULK_WORKERS)
+    args = parser.parse_args()
+
+    dsn = args.dsn or os.environ.get('DATABASE_URL')
+
+    def connect():
+        return Database(dsn, args.db)
+
+    objects = SupabaseObjects() if args.bucket else LocalObjects(args.objects)
+
+    if args.command == 'bulk':
+        done, failed = run_bulk(connect, objects, args.out, args.workers, args.page_size, args.blob_workers)
+        print(f"{'⚠' if failed else '✓'} {done} exports written, {failed} failed")
+        return 1 if failed else 0
+
+    db = connect()
+    try:
+        if args.command == 'enqueue':
+            ids = enqueue(db, args.user_ids)
+            print(f"✓ Queued {len(ids)} export requests")
+            return 0
+        manifest = export_user(db, objects, args.user_id, args.out, args.page_size, args.blob_workers)
+    finally:
+        db.close()
+    rows = sum(manifest['tables'].values())
+    missing = len(manifest['missing_documents'])
+    print(f"{'⚠' if missing else '✓'} Wrote {manifest['archive_path']}: {rows} rows, "
+          f"{len(manifest['documents'])} documents, {missing} missing blobs")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
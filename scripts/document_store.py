@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+Content-addressed, deduplicating store for user documents.
+
+uploadDocument used to write every file under a random per-user key, so the
+same passport scan attached to five tasks was uploaded and stored five
+times. Here uploads are streamed through an incremental SHA-256 into a
+bounded spool file; each unique content is stored once at
+blobs/<aa>/<sha256> (a document_blobs row, see migration
+20251202040000_document_blobs.sql), and every attachment is just a
+documents row referencing it. Storage therefore grows with unique
+documents, not attachments. The app's uploads follow the same layout through
+the documents-upload edge function, which hashes the file server-side.
+
+Subcommands:
+  put       store a file for a user (prints the documents row)
+  dedupe    streaming pass over legacy documents rows (content_sha256 IS
+            NULL): hash each object, point the row at the shared blob and
+            remove the now-redundant per-user object
+  gc        delete blobs that have had no references for --grace-hours
+
+Metadata lives in a local SQLite stand-in (same schema and ref-count
+triggers as the migration) or Postgres via --dsn; objects live in a local
+directory stand-in or the Supabase `documents` bucket (--bucket, needs
+SUPABASE_URL/SUPABASE_SERVICE_ROLE_KEY; supabase is imported lazily).
+
+Usage:
+  python scripts/document_store.py put USER_ID FILE [--task TASK_ID]
+  python scripts/document_store.py dedupe [--page-size 200] [--dry-run]
+  python scripts/document_store.py gc [--grace-hours 24]
+"""
+import argparse
+import hashlib
+import json
+import mimetypes
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+DEFAULT_DB = Path('.cache/document_store.sqlite')
+DEFAULT_OBJECTS = Path('.cache/document_objects')
+BUCKET_NAME = 'documents'
+CHUNK_SIZE = 1024 * 1024
+SPOOL_MEMORY_BYTES = 1024 * 1024
+MAX_FILE_SIZE = 10 * 1024 * 1024
+ALLOWED_MIME_TYPES = ('application/pdf', 'image/jpeg', 'image/jpg', 'image/png')
+PAGE_SIZE = 200
+GC_GRACE = timedelta(hours=24)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS document_blobs (
+    sha256 text PRIMARY KEY,
+    storage_key text NOT NULL UNIQUE,
+    size integer NOT NULL,
+    mime_type text NOT NULL,
+    ref_count integer NOT NULL DEFAULT 0,
+    created_at text DEFAULT CURRENT_TIMESTAMP,
+    orphaned_at text
+);
+CREATE TABLE IF NOT EXISTS documents (
+    id text PRIMARY KEY,
+    user_id text,
+    task_id text,
+    storage_key text NOT NULL,
+    file_name text NOT NULL,
+    mime_type text NOT NULL,
+    size integer NOT NULL,
+    uploaded_at text DEFAULT CURRENT_TIMESTAMP,
+    content_sha256 text REFERENCES document_blobs(sha256)
+);
+CREATE INDEX IF NOT EXISTS idx_documents_user_content_sha256 ON documents(user_id, content_sha256);
+CREATE TRIGGER IF NOT EXISTS documents_blob_refs_insert AFTER INSERT ON documents
+WHEN NEW.content_sha256 IS NOT NULL BEGIN
+    UPDATE document_blobs SET ref_count = ref_count + 1, orphaned_at = NULL WHERE sha256 = NEW.content_sha256;
+END;
+CREATE TRIGGER IF NOT EXISTS documents_blob_refs_delete AFTER DELETE ON documents
+WHEN OLD.content_sha256 IS NOT NULL BEGIN
+    UPDATE document_blobs SET ref_count = ref_count - 1,
+        orphaned_at = CASE WHEN ref_count - 1 = 0 THEN CURRENT_TIMESTAMP ELSE orphaned_at END
+    WHERE sha256 = OLD.content_sha256;
+END;
+CREATE TRIGGER IF NOT EXISTS documents_blob_refs_update AFTER UPDATE OF content_sha256 ON documents BEGIN
+    UPDATE document_blobs SET ref_count = ref_count - 1,
+        orphaned_at = CASE WHEN ref_count - 1 = 0 THEN CURRENT_TIMESTAMP ELSE orphaned_at END
+    WHERE sha256 = OLD.content_sha256;
+    UPDATE document_blobs SET ref_count = ref_count + 1, orphaned_at = NULL WHERE sha256 = NEW.content_sha256;
+END;
+"""
+
+
+class DocumentStoreError(Exception):
+    pass
+
+
+def blob_key(sha256):
+    return f'blobs/{sha256[:2]}/{sha256}'
+
+
+def hash_stream(stream, spool, max_size=MAX_FILE_SIZE, chunk_size=CHUNK_SIZE):
+    """Copy stream into spool chunk by chunk; returns (sha256 hex, size)"""
+    digest = hashlib.sha256()
+    size = 0
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        size += len(chunk)
+        if max_size is not None and size > max_size:
+            raise DocumentStoreError(f'File size exceeds {max_size // (1024 * 1024)}MB limit.')
+        digest.update(chunk)
+        spool.write(chunk)
+    spool.seek(0)
+    return digest.hexdigest(), size
+
+
+class LocalObjects:
+    """Directory stand-in for the storage bucket"""
+
+    def __init__(self, root=DEFAULT_OBJECTS):
+        self.root = Path(root)
+
+    def _path(self, key):
+        return self.root / key
+
+    def put(self, key, fileobj):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + '.part')
+        with open(tmp, 'wb') as f:
+            shutil.copyfileobj(fileobj, f, CHUNK_SIZE)
+        os.replace(tmp, path)
+
+    def open(self, key):
+        return open(self._path(key), 'rb')
+
+    def remove(self, keys):
+        for key in keys:
+            self._path(key).unlink(missing_ok=True)
+
+
+class SupabaseObjects:
+    """The Supabase `documents` bucket (service role)"""
+
+    def __init__(self, bucket=BUCKET_NAME):
+        url = os.environ.get('SUPABASE_URL') or os.environ.get('VITE_SUPABASE_URL')
+        key = os.environ.get('SUPABASE_SERVICE_ROLE_KEY')
+        if not url or not key:
+            raise SystemExit("Error: SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY must be set for --bucket")
+        from supabase import create_client
+        self.bucket = create_client(url, key).storage.from_(bucket)
+
+    def put(self, key, fileobj):
+        self.bucket.upload(key, fileobj.read(), {'upsert': 'true', 'cache-control': '3600'})
+
+    def open(self, key):
+        spool = tempfile.SpooledTemporaryFile(SPOOL_MEMORY_BYTES)
+        spool.write(self.bucket.download(key))
+        spool.seek(0)
+        return spool
+
+    def remove(self, keys):
+        if keys:
+            self.bucket.remove(list(keys))
+
+
+class DocumentStore:
+    def __init__(self, conn, objects, placeholder='?'):
+        self.conn = conn
+        self.objects = objects
+        self.ph = placeholder
+
+    def _q(self, sql):
+        return sql.replace('?', self.ph)
+
+    def _execute(self, sql, params=()):
+        cur = self.conn.cursor()
+        cur.execute(self._q(sql), params)
+        return cur
+
+    def _row(self, document_id):
+        cur = self._execute("SELECT * FROM documents WHERE id = ?", (document_id,))
+        columns = [c[0] for c in cur.description]
+        return dict(zip(columns, cur.fetchone()))
+
+    def _ensure_blob(self, sha256, size, mime_type, spool):
+        """Upload the blob unless it is already stored; returns True if uploaded"""
+        found = self._execute("SELECT storage_key FROM document_blobs WHERE sha256 = ?", (sha256,)).fetchone()
+        if found:
+            return False
+        key = blob_key(sha256)
+        self.objects.put(key, spool)
+        self._execute(
+            "INSERT INTO document_blobs (sha256, storage_key, size, mime_type) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (sha256) DO NOTHING", (sha256, key, size, mime_type))
+        return True
+
+    def attach_existing(self, user_id, sha256, file_name, task_id=None):
+        """Reference content the user already stored without re-uploading it"""
+        found = self._execute(
+            "SELECT b.storage_key, b.size, b.mime_type FROM documents d "
+            "JOIN document_blobs b ON b.sha256 = d.content_sha256 "
+            "WHERE d.user_id = ? AND d.content_sha256 = ? LIMIT 1", (user_id, sha256)).fetchone()
+        if not found:
+            return None
+        return self._reference(user_id, task_id, sha256, found[0], file_name, found[2], found[1])
+
+    def _reference(self, user_id, task_id, sha256, key, file_name, mime_type, size):
+        document_id = str(uuid.uuid4())
+        self._execute(
+            "INSERT INTO documents (id, user_id, task_id, storage_key, file_name, mime_type, size, content_sha256) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", (document_id, user_id, task_id, key, file_name, mime_type, size, sha256))
+        self.conn.commit()
+        return self._row(document_id)
+
+    def put(self, user_id, stream, file_name, mime_type, task_id=None):
+        """Stream an upload through SHA-256 and store it once; returns the documents row"""
+        if mime_type not in ALLOWED_MIME_TYPES:
+            raise DocumentStoreError('Invalid file type. Only PDF, JPG, and PNG are allowed.')
+        with tempfile.SpooledTemporaryFile(SPOOL_MEMORY_BYTES) as spool:
+            sha256, size = hash_stream(stream, spool)
+            uploaded = self._ensure_blob(sha256, size, mime_type, spool)
+        try:
+            row = self._reference(user_id, task_id, sha256, blob_key(sha256), file_name, mime_type, size)
+        except Exception:
+            self.conn.rollback()
+            raise
+        row['deduplicated'] = not uploaded
+        return row
+
+    def delete(self, user_id, document_id):
+        """Drop a reference; the blob is reclaimed by gc once nothing points at it"""
+        self._execute("DELETE FROM documents WHERE id = ? AND user_id = ?", (document_id, user_id))
+        self.conn.commit()
+
+    def dedupe(self, page_size=PAGE_SIZE, dry_run=False):
+        """Fold legacy per-user objects into the blob store, one keyset page at a time"""
+        stats = {'rows': 0, 'unique': 0, 'duplicates': 0, 'missing': 0, 'bytes_reclaimed': 0}
+        select = ("SELECT id, storage_key, mime_type, size FROM documents "
+                  "WHERE content_sha256 IS NULL AND user_id IS NOT NULL")
+        # documents.id is uuid in Postgres: the first page has no lower bound,
+        # later pages continue from the last id as the driver returned it
+        after = None
+        while True:
+            if after is None:
+                rows = self._execute(f"{select} ORDER BY id LIMIT ?", (page_size,)).fetchall()
+            else:
+                rows = self._execute(f"{select} AND id > ? ORDER BY id LIMIT ?", (after, page_size)).fetchall()
+            if not rows:
+                break
+            after = rows[-1][0]
+            stale = []
+            for document_id, key, mime_type, size in rows:
+                stats['rows'] += 1
+                try:
+                    source = self.objects.open(key)
+                except (FileNotFoundError, OSError):
+                    stats['missing'] += 1
+                    continue
+                with source, tempfile.SpooledTemporaryFile(SPOOL_MEMORY_BYTES) as spool:
+                    sha256, actual_size = hash_stream(source, spool, max_size=None)
+                    if dry_run:
+                        known = self._execute("SELECT 1 FROM document_blobs WHERE sha256 = ?", (sha256,)).fetchone()
+                        uploaded = not known
+                        if uploaded:
+                            # Count later duplicates within the same dry run
+                            self._execute("INSERT INTO document_blobs (sha256, storage_key, size, mime_type) "
+                                          "VALUES (?, ?, ?, ?)", (sha256, blob_key(sha256), actual_size, mime_type))
+                    else:
+                        uploaded = self._ensure_blob(sha256, actual_size, mime_type, spool)
+                stats['unique' if uploaded else 'duplicates'] += 1
+                stats['bytes_reclaimed'] += 0 if uploaded else actual_size
+                if not dry_run:
+                    self._execute("UPDATE documents SET content_sha256 = ?, storage_key = ?, size = ? WHERE id = ?",
+                                  (sha256, blob_key(sha256), actual_size, document_id))
+                if key != blob_key(sha256):
+                    stale.append(key)
+            if dry_run:
+                continue
+            # Commit before removing objects so a crash never leaves rows pointing at deleted keys
+            self.conn.commit()
+            self.objects.remove(stale)
+        if dry_run:
+            self.conn.rollback()
+        return stats
+
+    def gc(self, grace=GC_GRACE, now=None):
+        """Remove blobs unreferenced for longer than grace; returns the number removed"""
+        cutoff = ((now or datetime.now(timezone.utc)) - grace).strftime('%Y-%m-%d %H:%M:%S')
+        rows = self._execute(
+            "SELECT sha256, storage_key FROM document_blobs WHERE ref_count = 0 AND orphaned_at < ?",
+            (cutoff,)).fetchall()
+        removed = []
+        for sha256, key in rows:
+            # A reference may have arrived since the SELECT; only delete objects whose row actually went
+            cur = self._execute("DELETE FROM document_blobs WHERE sha256 = ? AND ref_count = 0", (sha256,))
+            if cur.rowcount:
+                removed.append(key)
+        self.conn.commit()
+        self.objects.remove(removed)
+        return len(removed)
+
+
+def connect(args):
+    dsn = args.dsn or os.environ.get('DATABASE_URL')
+    if dsn:
+        import psycopg
+        return psycopg.connect(dsn), '%s'
+    if args.db != ':memory:':
+        Path(args.db).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(args.db)
+    conn.executescript(SCHEMA)
+    return conn, '?'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', default=str(DEFAULT_DB), help='SQLite stand-in (used when no DSN is set)')
+    parser.add_argument('--dsn', help='Postgres DSN (default: $DATABASE_URL)')
+    parser.add_argument('--objects', default=str(DEFAULT_OBJECTS), help='Local object directory stand-in')
+    parser.add_argument('--bucket', action='store_true', help='Use the Supabase documents bucket')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    put = sub.add_parser('put', help='Store a file for a user')
+    put.add_argument('user_id')
+    put.add_argument('file')
+    put.add_argument('--task')
+    put.add_argument('--mime-type')
+    dedupe = sub.add_parser('dedupe', help='Fold legacy objects into the blob store')
+    dedupe.add_argument('--page-size', type=int, default=PAGE_SIZE)
+    dedupe.add_argument('--dry-run', action='store_true')
+    gc = sub.add_parser('gc', help='Remove unreferenced blobs')
+    gc.add_argument('--grace-hours', type=float, default=GC_GRACE.total_seconds() / 3600)
+
+    args = parser.parse_args()
+    conn, placeholder = connect(args)
+    objects = SupabaseObjects() if args.bucket else LocalObjects(args.objects)
+    store = DocumentStore(conn, objects, placeholder)
+
+    try:
+        if args.command == 'put':
+            path = Path(args.file)
+            mime_type = args.mime_type or mimetypes.guess_type(path.name)[0] or 'application/octet-stream'
+            with open(path, 'rb') as f:
+                row = store.put(args.user_id, f, path.name, mime_type, args.task)
+            print(json.dumps(row, indent=2, default=str))
+        elif args.command == 'dedupe':
+            stats = store.dedupe(args.page_size, args.dry_run)
+            print(f"{'(dry run) ' if args.dry_run else ''}✓ {stats['rows']} legacy rows: "
+                  f"{stats['unique']} unique, {stats['duplicates']} duplicates, {stats['missing']} missing objects, "
+                  f"{stats['bytes_reclaimed'] / (1024 * 1024):.1f} MB reclaimable")
+        else:
+            removed = store.gc(timedelta(hours=args.grace_hours))
+            print(f"✓ Removed {removed} unreferenced blobs")
+    except DocumentStoreError as e:
+        print(f"✗ {e}", file=sys.stderr)
+        return 1
+    finally:
+        conn.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
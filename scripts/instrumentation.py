@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Timing and profiling instrumentation for the Python tooling.
+
+The scripts only report progress through print("✓ ...") lines, so a slow
+release run doesn't say whether parse, mutate or serialize is the cost.
+This module records per-phase wall time, bytes read and written and the
+change in resident memory across each phase (plus peak RSS for the whole
+run), and at exit writes a JSON trace plus a short human summary. Any
+script can be run under it without edits:
+
+  python scripts/instrumentation.py [--profile cprofile|tracemalloc] \\
+      [--trace PATH] scripts/update_subtask_i18n.py [args...]
+
+or opt in from inside a script (or with M2G_TRACE=1 in the environment):
+
+  from instrumentation import phase
+  with phase('mutate', path):
+      ...
+
+phase() is a no-op until instrumentation is enabled, so shared helpers can
+call it unconditionally.
+"""
+import argparse
+import atexit
+import builtins
+import io
+import json
+import os
+import runpy
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+TRACE_DIR = Path('.cache/traces')
+PROFILE_TOP = 20
+
+
+def peak_rss_kib():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, KiB elsewhere
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def current_rss_kib():
+    """Resident set size right now (Linux only; None elsewhere)"""
+    # os.open bypasses the open() hooks, so sampling never shows up as I/O
+    try:
+        fd = os.open('/proc/self/statm', os.O_RDONLY)
+        try:
+            pages = int(os.read(fd, 256).split()[1])
+        finally:
+            os.close(fd)
+    except (OSError, IndexError, ValueError):
+        return None
+    return pages * os.sysconf('SC_PAGE_SIZE') // 1024
+
+
+class _CountingFile:
+    """File proxy that attributes bytes and I/O time to its path"""
+
+    def __init__(self, raw, tracer, path):
+        self._raw = raw
+        self._tracer = tracer
+        self._path = path
+        self._encoding = getattr(raw, 'encoding', None) or 'utf-8'
+
+    def _size(self, data):
+        """Byte count of data as it is on disk (text is encoded with the file's encoding)"""
+        if not isinstance(data, str):
+            return len(data)
+        if data.isascii():
+            return len(data)
+        return len(data.encode(self._encoding, errors='replace'))
+
+    def _record(self, name, data, started):
+        self._tracer.record(name, self._path, time.perf_counter() - started,
+                            **{'bytes_read' if name == 'read' else 'bytes_written': self._size(data)})
+
+    def read(self, *args):
+        started = time.perf_counter()
+        data = self._raw.read(*args)
+        self._record('read', data, started)
+        return data
+
+    def readline(self, *args):
+        started = time.perf_counter()
+        data = self._raw.readline(*args)
+        self._record('read', data, started)
+        return data
+
+    def __iter__(self):
+        for line in self._raw:
+            self._tracer.record('read', self._path, 0.0, bytes_read=self._size(line))
+            yield line
+
+    def write(self, data):
+        started = time.perf_counter()
+        written = self._raw.write(data)
+        self._record('write', data, started)
+        return written
+
+    def __enter__(self):
+        self._raw.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        return self._raw.__exit__(*exc)
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+
+class Tracer:
+    def __init__(self):
+        self.enabled = False
+        self.started = time.perf_counter()
+        self.phases = {}
+        self._original_open = None
+
+    def record(self, name, target=None, seconds=0.0, bytes_read=0, bytes_written=0, rss_delta_kib=None):
+        if not self.enabled:
+            return
+        key = (name, str(target) if target is not None else None)
+        entry = self.phases.setdefault(key, {
+            'phase': name, 'target': key[1], 'calls': 0, 'seconds': 0.0,
+            'bytes_read': 0, 'bytes_written': 0, 'rss_delta_kib': None,
+        })
+        entry['calls'] += 1
+        entry['seconds'] += seconds
+        entry['bytes_read'] += bytes_read
+        entry['bytes_written'] += bytes_written
+        if rss_delta_kib is not None:
+            entry['rss_delta_kib'] = (entry['rss_delta_kib'] or 0) + rss_delta_kib
+
+    @contextmanager
+    def phase(self, name, target=None):
+        if not self.enabled:
+            yield
+            return
+        rss_before = current_rss_kib()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - started
+            rss_after = current_rss_kib()
+            delta = rss_after - rss_before if rss_before is not None and rss_after is not None else None
+            self.record(name, target, seconds, rss_delta_kib=delta)
+
+    def install_io_hooks(self):
+        """Route builtins.open / io.open (and so Path.read_text etc.) through _CountingFile"""
+        original = builtins.open
+        self._original_open = original
+        tracer = self
+
+        def traced_open(file, mode='r', *args, **kwargs):
+            raw = original(file, mode, *args, **kwargs)
+            if isinstance(file, int) or not any(m in mode for m in 'rwax+'):
+                return raw
+            return _CountingFile(raw, tracer, os.fspath(file))
+
+        builtins.open = traced_open
+        io.open = traced_open
+
+    def remove_io_hooks(self):
+        if self._original_open:
+            builtins.open = self._original_open
+            io.open = self._original_open
+            self._original_open = None
+
+    def report(self):
+        phases = sorted(self.phases.values(), key=lambda p: p['seconds'], reverse=True)
+        for p in phases:
+            p['seconds'] = round(p['seconds'], 6)
+        return {
+            'command': sys.argv,
+            'wall_seconds': round(time.perf_counter() - self.started, 6),
+            'peak_rss_kib': peak_rss_kib(),
+            'phases': phases,
+        }
+
+
+tracer = Tracer()
+phase = tracer.phase
+
+
+def summary_lines(report, limit=15):
+    lines = [f"⏱  {report['wall_seconds'] * 1000:.1f} ms total, peak RSS {report['peak_rss_kib']} KiB"]
+    for p in report['phases'][:limit]:
+        target = f" {p['target']}" if p['target'] else ''
+        io_info = ''
+        if p['bytes_read'] or p['bytes_written']:
+            io_info = f"  r={p['bytes_read']}B w={p['bytes_written']}B"
+        if p['rss_delta_kib']:
+            io_info += f"  rss{p['rss_delta_kib']:+d}KiB"
+        lines.append(f"   {p['seconds'] * 1000:9.2f} ms  {p['phase']:<10}{target} (x{p['calls']}){io_info}")
+    return lines
+
+
+def enable(trace_path=None, io_hooks=True):
+    """Start recording and write the trace + summary at interpreter exit"""
+    if tracer.enabled:
+        return tracer
+    tracer.enabled = True
+    tracer.started = time.perf_counter()
+    if io_hooks:
+        tracer.install_io_hooks()
+
+    def finish():
+        tracer.remove_io_hooks()
+        write_trace(tracer.report(), trace_path)
+
+    atexit.register(finish)
+    return tracer
+
+
+def default_trace_path():
+    script = Path(sys.argv[0]).stem if sys.argv and sys.argv[0] else 'python'
+    return TRACE_DIR / f"{script}-{time.strftime('%Y%m%d-%H%M%S')}.json"
+
+
+def write_trace(report, trace_path=None, extra=None):
+    path = Path(trace_path) if trace_path else default_trace_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if extra:
+        report.update(extra)
+    path.write_text(json.dumps(report, indent=2), encoding='utf-8')
+    for line in summary_lines(report):
+        print(line, file=sys.stderr)
+    print(f"   trace: {path}", file=sys.stderr)
+    return path
+
+
+def _run_script(script, args):
+    sys.argv = [script] + args
+    sys.path.insert(0, str(Path(script).resolve().parent))
+    try:
+        runpy.run_path(script, run_name='__main__')
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--trace', help='JSON trace path (default .cache/traces/<script>-<time>.json)')
+    parser.add_argument('--profile', choices=['cprofile', 'tracemalloc'])
+    parser.add_argument('script')
+    parser.add_argument('args', nargs=argparse.REMAINDER)
+    args = parser.parse_args()
+
+    # Scripts that `from instrumentation import phase` must see this tracer
+    sys.modules.setdefault('instrumentation', sys.modules['__main__'])
+
+    trace_path = Path(args.trace) if args.trace else \
+        TRACE_DIR / f"{Path(args.script).stem}-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    tracer.enabled = True
+    tracer.started = time.perf_counter()
+    tracer.install_io_hooks()
+
+    extra = {}
+    if args.profile == 'cprofile':
+        import cProfile
+        import pstats
+        profiler = cProfile.Profile()
+        profiler.enable()
+        code = _run_script(args.script, args.args)
+        profiler.disable()
+        # dump_stats opens its file through builtins.open; keep it out of the trace
+        tracer.remove_io_hooks()
+        prof_path = trace_path.with_suffix('.prof')
+        prof_path.parent.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(str(prof_path))
+        stats = pstats.Stats(profiler).sort_stats('cumulative')
+        extra['cprofile'] = {
+            'stats_file': str(prof_path),
+            'top': [
+                {'function': f"{func[0]}:{func[1]}:{func[2]}", 'calls': s[1], 'cumulative_seconds': round(s[3], 6)}
+                for func, s in sorted(stats.stats.items(), key=lambda kv: kv[1][3], reverse=True)[:PROFILE_TOP]
+            ],
+        }
+    elif args.profile == 'tracemalloc':
+        import tracemalloc
+        tracemalloc.start()
+        code = _run_script(args.script, args.args)
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        extra['tracemalloc'] = {
+            'peak_kib': round(peak / 1024, 1),
+            'top': [{'site': str(stat.traceback), 'kib': round(stat.size / 1024, 1)}
+                    for stat in snapshot.statistics('lineno')[:PROFILE_TOP]],
+        }
+    else:
+        code = _run_script(args.script, args.args)
+
+    tracer.remove_io_hooks()
+    write_trace(tracer.report(), trace_path, extra)
+    return code
+
+
+if os.environ.get('M2G_TRACE') and __name__ != '__main__':
+    enable(os.environ.get('M2G_TRACE_PATH'))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Link health checker for the URLs in config/.
+
+action_blocks_v1.json, external_services.json, housing_platforms.json and
+housing_providers.json hold dozens of official and partner links that rot
+silently. This walks each file once, collects every URL together with the
+JSON path(s) it appears under, and probes the unique URLs concurrently:
+
+  - a bounded worker pool caps the number of open connections
+  - requests to the same host are spaced at least --host-interval apart
+  - HEAD first, falling back to GET for servers that reject HEAD
+  - healthy results are cached for --ttl seconds (.cache/link_health.json),
+    so unchanged links are not re-probed on every run; failures always are
+
+URL templates (housing_providers urlTemplate, external_services {city})
+are expanded with a sample city the same way src/lib/housing.ts does.
+
+`selftest` runs the checker against a local stub HTTP server.
+
+Usage:
+  python scripts/link_checker.py check [--concurrency 16] [--ttl 86400] [--json] [--strict]
+  python scripts/link_checker.py selftest
+"""
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from config_tools import CONFIG_DIR, load_json
+
+LINK_SOURCES = (
+    'action_blocks_v1.json',
+    'external_services.json',
+    'housing_platforms.json',
+    'housing_providers.json',
+)
+CACHE_PATH = Path('.cache/link_health.json')
+CONCURRENCY = 16
+HOST_INTERVAL_SECONDS = 1.0
+TIMEOUT_SECONDS = 15
+CACHE_TTL_SECONDS = 24 * 3600
+USER_AGENT = 'Move2Germany-LinkChecker/1.0'
+HEAD_FALLBACK_STATUSES = {403, 405, 501}
+
+# Sample values for templated URLs, mirroring generateHousingUrl in src/lib/housing.ts
+TEMPLATE_VALUES = {
+    '{{citySlug}}': 'berlin',
+    '{{cityCode}}': '8',
+    '{{maxRent}}': '',
+    '{{minSize}}': '',
+    '{city}': 'berlin',
+}
+
+
+def expand_template(url):
+    for placeholder, value in TEMPLATE_VALUES.items():
+        url = url.replace(placeholder, value)
+    return url
+
+
+def extract_urls(data, prefix=''):
+    """Yield (json_path, url) for every http(s) string in a JSON document"""
+    if isinstance(data, dict):
+        for key, value in data.items():
+            yield from extract_urls(value, f'{prefix}.{key}' if prefix else key)
+    elif isinstance(data, list):
+        for i, value in enumerate(data):
+            yield from extract_urls(value, f'{prefix}[{i}]')
+    elif isinstance(data, str) and data.startswith(('http://', 'https://')):
+        yield prefix, expand_template(data)
+
+
+def collect_links(config_dir=CONFIG_DIR, sources=LINK_SOURCES):
+    """Return {url: [config_path, ...]} across all source files"""
+    links = {}
+    for name in sources:
+        for json_path, url in extract_urls(load_json(Path(config_dir) / name)):
+            links.setdefault(url, []).append(f'{name}:{json_path}')
+    return links
+
+
+def probe(url, timeout=TIMEOUT_SECONDS):
+    """Blocking single-URL probe; returns a result dict (never raises)"""
+    started = time.monotonic()
+    result = {'url': url, 'status': None, 'final_url': None, 'error': None}
+    for method in ('HEAD', 'GET'):
+        request = urllib.request.Request(url, method=method, headers={'User-Agent': USER_AGENT})
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                result.update(status=response.status, final_url=response.geturl(), error=None)
+        except urllib.error.HTTPError as e:
+            result.update(status=e.code, final_url=e.geturl(), error=None)
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            result.update(status=None, error=str(getattr(e, 'reason', e)))
+        if method == 'HEAD' and result['status'] in HEAD_FALLBACK_STATUSES:
+            continue
+        break
+    result['ok'] = result['status'] is not None and result['status'] < 400
+    result['elapsed_ms'] = round((time.monotonic() - started) * 1000)
+    result['checked_at'] = time.time()
+    return result
+
+
+class HostLimiter:
+    """Serializes requests per host and spaces them at least `interval` apart"""
+
+    def __init__(self, interval=HOST_INTERVAL_SECONDS):
+        self.interval = interval
+        self.locks = {}
+        self.last = {}
+
+    async def run(self, host, call):
+        lock = self.locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            wait = self.last.get(host, 0) + self.interval - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            try:
+                return await call()
+            finally:
+                self.last[host] = time.monotonic()
+
+
+class LinkCache:
+    def __init__(self, path=CACHE_PATH, ttl=CACHE_TTL_SECONDS):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.entries = json.loads(self.path.read_text(encoding='utf-8')) if self.path.exists() else {}
+
+    def fresh(self, url, now=None):
+        entry = self.entries.get(url)
+        if not entry or not entry.get('ok'):
+            return None
+        return entry if (now or time.time()) - entry['checked_at'] < self.ttl else None
+
+    def store(self, result):
+        self.entries[result['url']] = result
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(self.entries, indent=2, ensure_ascii=False), encoding='utf-8')
+        tmp.replace(self.path)
+
+
+async def check_links(urls, cache, concurrency=CONCURRENCY, host_interval=HOST_INTERVAL_SECONDS,
+                      timeout=TIMEOUT_SECONDS):
+    """Probe every URL not fresh in the cache; returns ({url: result}, probed_count)"""
+    results = {}
+    pending = []
+    for url in urls:
+        cached = cache.fresh(url)
+        if cached:
+            results[url] = {**cached, 'cached': True}
+        else:
+            pending.append(url)
+
+    loop = asyncio.get_running_loop()
+    limiter = HostLimiter(host_interval)
+    slots = asyncio.Semaphore(concurrency)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        async def one(url):
+            async def call():
+                async with slots:
+                    return await loop.run_in_executor(pool, probe, url, timeout)
+            result = await limiter.run(urlsplit(url).netloc.lower(), call)
+            cache.store(result)
+            results[url] = {**result, 'cached': False}
+
+        await asyncio.gather(*(one(url) for url in pending))
+    return results, len(pending)
+
+
+def build_report(links, results):
+    """Re-key probe results by config file and JSON path"""
+    report = {}
+    for url, paths in links.items():
+        for path in paths:
+            name, json_path = path.split(':', 1)
+            report.setdefault(name, {})[json_path] = results[url]
+    return report
+
+
+def run_check(config_dir=CONFIG_DIR, cache_path=CACHE_PATH, ttl=CACHE_TTL_SECONDS, concurrency=CONCURRENCY,
+              host_interval=HOST_INTERVAL_SECONDS, timeout=TIMEOUT_SECONDS, sources=LINK_SOURCES):
+    links = collect_links(config_dir, sources)
+    cache = LinkCache(cache_path, ttl)
+    results, probed = asyncio.run(check_links(list(links), cache, concurrency, host_interval, timeout))
+    cache.save()
+    return build_report(links, results), len(links), probed
+
+
+def print_report(report):
+    broken = 0
+    for name, entries in sorted(report.items()):
+        bad = {p: r for p, r in entries.items() if not r['ok']}
+        broken += len(bad)
+        print(f"{'✗' if bad else '✓'} {name}: {len(entries) - len(bad)}/{len(entries)} links healthy")
+        for json_path, r in sorted(bad.items()):
+            print(f"    {json_path}: {r['status'] or r['error']}  {r['url']}")
+    return broken
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    hits = {}
+
+    def _respond(self, body):
+        _StubHandler.hits[self.path] = _StubHandler.hits.get(self.path, 0) + 1
+        if self.path == '/ok':
+            status = 200
+        elif self.path == '/moved':
+            self.send_response(301)
+            self.send_header('Location', '/ok')
+            self.end_headers()
+            return
+        elif self.path == '/get-only':
+            status = 405 if self.command == 'HEAD' else 200
+        else:
+            status = 404
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if self.command == 'GET':
+            self.wfile.write(body)
+
+    def do_HEAD(self):
+        self._respond(b'')
+
+    def do_GET(self):
+        self._respond(b'ok')
+
+    def log_message(self, *args):
+        pass
+
+
+def selftest():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f'http://127.0.0.1:{server.server_address[1]}'
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            (tmp / 'links.json').write_text(json.dumps({
+                'services': [
+                    {'id': 'a', 'baseUrl': f'{base}/ok', 'searchUrl': f'{base}/ok'},
+                    {'id': 'b', 'baseUrl': f'{base}/moved', 'searchUrl': f'{base}/get-only'},
+                    {'id': 'c', 'urlTemplate': f'{base}/missing/{{{{citySlug}}}}'},
+                ],
+                'unreachable': 'http://127.0.0.1:9/closed',
+            }), encoding='utf-8')
+            options = dict(config_dir=tmp, cache_path=tmp / 'cache.json', host_interval=0.05,
+                           timeout=2, sources=('links.json',))
+
+            report, total, probed = run_check(**options)
+            entries = report['links.json']
+            assert total == 5 and probed == 5, (total, probed)
+            assert entries['services[0].baseUrl']['ok'] and entries['services[0].searchUrl']['ok']
+            assert entries['services[1].baseUrl']['final_url'].endswith('/ok')
+            assert entries['services[1].searchUrl']['status'] == 200, 'HEAD 405 should fall back to GET'
+            assert entries['services[2].urlTemplate']['status'] == 404
+            assert entries['services[2].urlTemplate']['url'].endswith('/missing/berlin')
+            assert not entries['unreachable']['ok'] and entries['unreachable']['error']
+
+            hits_before = dict(_StubHandler.hits)
+            _, _, probed = run_check(**options)
+            assert probed == 2, f'only failures should be re-probed, got {probed}'
+            assert _StubHandler.hits['/ok'] == hits_before['/ok'], 'cached links were re-probed'
+    finally:
+        server.shutdown()
+    print("✓ link checker selftest passed")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest='command', required=True)
+    check = sub.add_parser('check', help='Probe every config URL')
+    check.add_argument('--concurrency', type=int, default=CONCURRENCY)
+    check.add_argument('--host-interval', type=float, default=HOST_INTERVAL_SECONDS)
+    check.add_argument('--timeout', type=float, default=TIMEOUT_SECONDS)
+    check.add_argument('--ttl', type=int, default=CACHE_TTL_SECONDS, help='Seconds to trust a healthy result')
+    check.add_argument('--json', action='store_true', help='Print the full report as JSON')
+    check.add_argument('--strict', action='store_true', help='Exit 1 if any link is broken')
+    sub.add_parser('selftest', help='Run against a local stub server')
+    args = parser.parse_args()
+
+    if args.command == 'selftest':
+        return selftest()
+
+    report, total, probed = run_check(ttl=args.ttl, concurrency=args.concurrency,
+                                      host_interval=args.host_interval, timeout=args.timeout)
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        return 0
+    broken = print_report(report)
+    print(f"{'⚠' if broken else '✓'} {total} unique URLs, {probed} probed, {total - probed} cached, {broken} broken")
+    return 1 if broken and args.strict else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+m2g - single entry point for the Move2Germany Python tooling.
+
+Subcommands:
+  validate      check task config references (ids, cities, modules, windows)
+  locale-sync   report / fill UI locale keys missing versus en.json
+  translate     fill missing overlay/locale strings via translation memory
+  bundle        write per-locale merged task catalogs with compiled city sets
+  patch         apply the registered source codemods
+  links         probe config URLs for broken links
+  ingest        run the document ingestion pipeline (npx tsx)
+  inspect       inspect the Supabase notes table
+
+The repo root is resolved from this file, so m2g works from any directory.
+Subcommand modules (and heavy dependencies such as supabase) are imported
+only when that subcommand runs, keeping `m2g validate` cheap enough for
+editor save hooks.
+
+Usage:
+  python scripts/m2g.py [--trace] <subcommand> [options]
+  npm run m2g -- <subcommand> [options]
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+DEFAULT_BUNDLE_DIR = Path('.cache/bundle')
+# User-supplied paths, resolved against the caller's directory before main()
+# changes into the repo root
+PATH_ARGS = ('config', 'out')
+# The same for path options inside pass-through arguments (translate)
+PASSTHROUGH_PATH_OPTIONS = ('--report',)
+
+
+def find_repo_root(start=SCRIPTS_DIR):
+    for candidate in (start, *start.parents):
+        if (candidate / 'package.json').exists() and (candidate / 'config').is_dir():
+            return candidate
+    raise SystemExit("✗ Could not locate the Move2Germany repo root")
+
+
+def resolve_passthrough_paths(extra):
+    """Resolve PASSTHROUGH_PATH_OPTIONS values (`--opt PATH` or `--opt=PATH`) against the cwd"""
+    resolved = list(extra)
+    for i, arg in enumerate(resolved):
+        option, eq, value = arg.partition('=')
+        if option not in PASSTHROUGH_PATH_OPTIONS:
+            continue
+        if eq:
+            resolved[i] = f"{option}={Path(value).resolve()}"
+        elif i + 1 < len(resolved):
+            resolved[i + 1] = str(Path(resolved[i + 1]).resolve())
+    return resolved
+
+
+def cmd_validate(args):
+    from config_tools import TASKS_PATH, load_json, validate_catalog
+
+    issues = validate_catalog(load_json(args.config or TASKS_PATH))
+    errors = [msg for severity, msg in issues if severity == 'error']
+    warnings = [msg for severity, msg in issues if severity == 'warning']
+    for msg in errors:
+        print(f"✗ {msg}")
+    if not args.quiet:
+        for msg in warnings:
+            print(f"⚠ {msg}")
+    print(f"{'✗' if errors else '✓'} {len(errors)} errors, {len(warnings)} warnings")
+    return 1 if errors or (args.strict and warnings) else 0
+
+
+def cmd_locale_sync(args):
+    from config_tools import BASE_LOCALE, UI_LOCALES, load_json, locale_path, save_json, sync_locale
+
+    base = load_json(locale_path(BASE_LOCALE))
+    missing_total = 0
+    for code in args.locales or [c for c in UI_LOCALES if c != BASE_LOCALE]:
+        target = load_json(locale_path(code))
+        added, conflicts = sync_locale(base, target)
+        missing_total += len(added)
+        for key in conflicts:
+            print(f"⚠ {code}.json: '{key}' conflicts with a string value, skipped")
+        if added and args.write:
+            save_json(locale_path(code), target)
+            print(f"✓ {code}.json: filled {len(added)} keys with {BASE_LOCALE} text")
+        else:
+            print(f"{'⚠' if added else '✓'} {code}.json: {len(added)} keys missing")
+    return 1 if missing_total and args.check else 0
+
+
+def cmd_translate(args):
+    from translation_fill import main as translate_main
+    return translate_main(args.extra)
+
+
+def cmd_bundle(args):
+    from city_registry import (ACTION_BLOCKS_PATH, HOUSING_PROVIDERS_PATH, CityRegistry, UnknownCityError,
+                               compile_action_blocks, compile_config, compile_housing_providers)
+    from config_tools import OVERLAY_LOCALES, TASKS_PATH, dump_json, load_json, merge_overlay, overlay_path
+
+    registry = CityRegistry.load()
+    config = load_json(TASKS_PATH)
+    out_dir = Path(args.out or DEFAULT_BUNDLE_DIR)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    outputs = {}
+    try:
+        for code in ('tr',) + OVERLAY_LOCALES:
+            tasks = config['tasks'] if code == 'tr' else merge_overlay(config['tasks'], load_json(overlay_path(code)))
+            outputs[f'tasks.{code}.json'] = compile_config({**config, 'tasks': tasks}, registry)
+        outputs['housing_providers.json'] = compile_housing_providers(load_json(HOUSING_PROVIDERS_PATH), registry)
+        outputs['action_blocks.json'] = compile_action_blocks(load_json(ACTION_BLOCKS_PATH), registry)
+    except UnknownCityError as e:
+        print(f"✗ {e}", file=sys.stderr)
+        return 1
+    outputs['cities.json'] = {'cities': registry.cities}
+    for name, data in outputs.items():
+        path = out_dir / name
+        path.write_text(dump_json(data), encoding='utf-8')
+        print(f"✓ Wrote {path}")
+    return 0
+
+
+PATCH_MODULES = ('apply_uat_hotfixes',)
+
+
+def cmd_patch(args):
+    import importlib
+    from codemod import print_report, registered_edits, run
+
+    for module in PATCH_MODULES:
+        importlib.import_module(module)
+    edits = registered_edits()
+    if args.only:
+        edits = [e for e in edits if e.name in args.only]
+    if args.list:
+        for edit in edits:
+            print(f"  {edit.name:<32} {edit.path}")
+        return 0
+    report, changed_files = run(edits, dry_run=args.dry_run, workers=args.workers)
+    return 0 if print_report(report, changed_files, args.dry_run) else 1
+
+
+def cmd_links(args):
+    from link_checker import print_report, run_check
+
+    report, total, probed = run_check(ttl=args.ttl, concurrency=args.concurrency)
+    broken = print_report(report)
+    print(f"{'⚠' if broken else '✓'} {total} unique URLs, {probed} probed, {total - probed} cached, {broken} broken")
+    return 1 if broken and args.strict else 0
+
+
+def cmd_ingest(args):
+    import subprocess
+    return subprocess.call(['npx', 'tsx', 'scripts/ingest-documents.ts', *args.extra])
+
+
+def cmd_inspect(args):
+    from inspect_db import main as inspect_main
+    return inspect_main()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='m2g', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--trace', action='store_true', help='Write a timing trace (see instrumentation.py)')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('validate', help='Validate the task config')
+    p.add_argument('--config', help='Path to a task config (default: config/move2germany_tasks_v1.json)')
+    p.add_argument('--strict', action='store_true', help='Treat warnings as errors')
+    p.add_argument('-q', '--quiet', action='store_true', help='Only print errors')
+    p.set_defaults(func=cmd_validate)
+
+    p = sub.add_parser('locale-sync', help='Report or fill missing UI locale keys')
+    p.add_argument('locales', nargs='*')
+    p.add_argument('--write', action='store_true', help='Fill missing keys with en text')
+    p.add_argument('--check', action='store_true', help='Exit 1 if any key is missing')
+    p.set_defaults(func=cmd_locale_sync)
+
+    p = sub.add_parser('translate', help='Fill missing translations (see translation_fill.py)')
+    p.add_argument('extra', nargs=argparse.REMAINDER)
+    p.set_defaults(func=cmd_translate)
+
+    p = sub.add_parser('bundle', help='Write merged per-locale task catalogs')
+    p.add_argument('--out', help='Output directory (default: .cache/bundle)')
+    p.set_defaults(func=cmd_bundle)
+
+    p = sub.add_parser('patch', help='Apply registered source codemods')
+    p.add_argument('--dry-run', action='store_true')
+    p.add_argument('--list', action='store_true')
+    p.add_argument('--only', nargs='+', metavar='EDIT')
+    p.add_argument('--workers', type=int)
+    p.set_defaults(func=cmd_patch)
+
+    p = sub.add_parser('links', help='Check config URLs for broken links')
+    p.add_argument('--concurrency', type=int, default=16)
+    p.add_argument('--ttl', type=int, default=24 * 3600, help='Seconds to trust a healthy result')
+    p.add_argument('--strict', action='store_true', help='Exit 1 if any link is broken')
+    p.set_defaults(func=cmd_links)
+
+    p = sub.add_parser('ingest', help='Run scripts/ingest-documents.ts')
+    p.add_argument('extra', nargs=argparse.REMAINDER)
+    p.set_defaults(func=cmd_ingest)
+
+    p = sub.add_parser('inspect', help='Inspect the Supabase notes table')
+    p.set_defaults(func=cmd_inspect)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args, unknown = parser.parse_known_args(argv)
+    if unknown:
+        # Options of pass-through subcommands (translate) are parsed by their own module
+        if args.command != 'translate':
+            parser.error(f"unrecognized arguments: {' '.join(unknown)}")
+        args.extra = unknown + args.extra
+    for name in PATH_ARGS:
+        if getattr(args, name, None):
+            setattr(args, name, str(Path(getattr(args, name)).resolve()))
+    if args.command == 'translate':
+        args.extra = resolve_passthrough_paths(args.extra)
+    os.chdir(find_repo_root())
+    if str(SCRIPTS_DIR) not in sys.path:
+        sys.path.insert(0, str(SCRIPTS_DIR))
+    if args.trace:
+        from instrumentation import enable
+        enable()
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
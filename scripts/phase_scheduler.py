@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Journey phase-transition scheduler.
+
+A user's phase is a pure function of `arrival_date` and the
+minDaysFromArrival/maxDaysFromArrival table in journey_phases_v1.json, so
+instead of recomputing every user every night we store the date of each
+user's next phase boundary in an indexed table and only touch the users
+whose boundary has passed. A daily run is O(changes) instead of O(users).
+
+Usage:
+  python scripts/phase_scheduler.py register <user_id> <arrival_date>
+  python scripts/phase_scheduler.py run [--today YYYY-MM-DD]
+"""
+import argparse
+import json
+import sqlite3
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+PHASES_PATH = Path('src/config/journey_phases_v1.json')
+TASKS_PATH = Path('config/move2germany_tasks_v1.json')
+DEFAULT_DB = Path('.cache/phase_schedule.sqlite')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS phase_schedule (
+    user_id text PRIMARY KEY,
+    arrival_date text,
+    phase_id text NOT NULL,
+    next_change_on text
+);
+CREATE INDEX IF NOT EXISTS idx_phase_schedule_next_change
+    ON phase_schedule(next_change_on);
+"""
+
+
+def load_journey_phases(path=PHASES_PATH):
+    """Load journey phases sorted by order (mirrors configLoader.getJourneyPhases)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        phases = json.load(f)
+    return sorted(phases, key=lambda p: p['order'])
+
+
+def days_from_arrival(arrival_date, today):
+    return (today - date.fromisoformat(arrival_date)).days
+
+
+def phase_for_day(diff_days, phases):
+    """Same matching and fallback rules as computeCurrentPhase in src/lib/journey.ts"""
+    for phase in phases:
+        max_days = phase.get('maxDaysFromArrival')
+        if diff_days >= phase['minDaysFromArrival'] and (max_days is None or diff_days <= max_days):
+            return phase
+    if diff_days < phases[0]['minDaysFromArrival']:
+        return phases[0]
+    return phases[-1]
+
+
+def compute_current_phase(arrival_date, phases, today):
+    if not arrival_date:
+        return phases[0]
+    return phase_for_day(days_from_arrival(arrival_date, today), phases)
+
+
+def next_phase_change(arrival_date, phases, today):
+    """Return the first date after `today` on which the user's phase differs, or None"""
+    if not arrival_date:
+        return None
+
+    diff_days = days_from_arrival(arrival_date, today)
+    current = phase_for_day(diff_days, phases)
+
+    # Phase can only change on a table boundary, so those are the only candidates
+    boundaries = set()
+    for phase in phases:
+        boundaries.add(phase['minDaysFromArrival'])
+        if phase.get('maxDaysFromArrival') is not None:
+            boundaries.add(phase['maxDaysFromArrival'] + 1)
+
+    for day in sorted(b for b in boundaries if b > diff_days):
+        if phase_for_day(day, phases)['id'] != current['id']:
+            return date.fromisoformat(arrival_date) + timedelta(days=day)
+    return None
+
+
+def tasks_by_time_window(path=TASKS_PATH):
+    with open(path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    grouped = {}
+    for task in config['tasks']:
+        ids = grouped.setdefault(task.get('timeWindow'), [])
+        if task['id'] not in ids:
+            ids.append(task['id'])
+    return grouped
+
+
+def default_phase_entry_action(tasks_path=TASKS_PATH):
+    """Build the default phase-entry hook: unlock the phase's tasks and queue a reminder"""
+    grouped = tasks_by_time_window(tasks_path)
+
+    def on_enter(user_id, old_phase_id, new_phase):
+        unlocked = grouped.get(new_phase['id'], [])
+        return {
+            'user_id': user_id,
+            'from_phase': old_phase_id,
+            'to_phase': new_phase['id'],
+            'unlocked_task_ids': unlocked,
+            'reminder': {'labelKey': new_phase['labelKey'], 'task_count': len(unlocked)},
+        }
+
+    return on_enter
+
+
+class PhaseScheduler:
+    """Priority table of next phase-boundary dates backed by SQLite"""
+
+    def __init__(self, db_path=DEFAULT_DB, phases=None):
+        self.phases = phases or load_journey_phases()
+        if str(db_path) != ':memory:':
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(db_path))
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def register(self, user_id, arrival_date, today=None):
+        """Insert or refresh a user after signup / onboarding / arrival_date edits"""
+        today = today or date.today()
+        phase = compute_current_phase(arrival_date, self.phases, today)
+        next_change = next_phase_change(arrival_date, self.phases, today)
+        self.conn.execute(
+            """INSERT INTO phase_schedule (user_id, arrival_date, phase_id, next_change_on)
+               VALUES (?, ?, ?, ?)
+               ON CONFLICT(user_id) DO UPDATE SET
+                   arrival_date = excluded.arrival_date,
+                   phase_id = excluded.phase_id,
+                   next_change_on = excluded.next_change_on""",
+            (user_id, arrival_date, phase['id'], next_change.isoformat() if next_change else None),
+        )
+        self.conn.commit()
+        return phase
+
+    def unregister(self, user_id):
+        self.conn.execute("DELETE FROM phase_schedule WHERE user_id = ?", (user_id,))
+        self.conn.commit()
+
+    def due(self, today):
+        return self.conn.execute(
+            """SELECT user_id, arrival_date, phase_id, next_change_on FROM phase_schedule
+               WHERE next_change_on IS NOT NULL AND next_change_on <= ?
+               ORDER BY next_change_on""",
+            (today.isoformat(),),
+        ).fetchall()
+
+    def run(self, today=None, on_enter=None):
+        """
+        Advance every user whose boundary has passed and fire phase-entry actions.
+
+        Boundaries are walked one at a time from the stored next_change_on, so a
+        missed run or a user crossing several boundaries still fires on_enter for
+        every phase entered, in order.
+        """
+        today = today or date.today()
+        on_enter = on_enter or default_phase_entry_action()
+        results = []
+
+        for user_id, arrival_date, phase_id, next_change_on in self.due(today):
+            boundary = date.fromisoformat(next_change_on)
+            while boundary is not None and boundary <= today:
+                phase = compute_current_phase(arrival_date, self.phases, boundary)
+                if phase['id'] != phase_id:
+                    results.append(on_enter(user_id, phase_id, phase))
+                    phase_id = phase['id']
+                boundary = next_phase_change(arrival_date, self.phases, boundary)
+            self.conn.execute(
+                "UPDATE phase_schedule SET phase_id = ?, next_change_on = ? WHERE user_id = ?",
+                (phase_id, boundary.isoformat() if boundary else None, user_id),
+            )
+
+        self.conn.commit()
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', default=str(DEFAULT_DB))
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    reg = sub.add_parser('register', help='Register or update a user arrival date')
+    reg.add_argument('user_id')
+    reg.add_argument('arrival_date', nargs='?', help='YYYY-MM-DD (omit if unknown)')
+
+    run = sub.add_parser('run', help='Process users whose phase boundary has passed')
+    run.add_argument('--today', type=date.fromisoformat, default=date.today())
+
+    args = parser.parse_args()
+    scheduler = PhaseScheduler(args.db)
+    try:
+        if args.command == 'register':
+            phase = scheduler.register(args.user_id, args.arrival_date)
+            print(f"✓ Registered {args.user_id} in phase {phase['id']}")
+        else:
+            transitions = scheduler.run(args.today)
+            for t in transitions:
+                print(f"✓ {t['user_id']}: {t['from_phase']} → {t['to_phase']} "
+                      f"({len(t['unlocked_task_ids'])} tasks unlocked)")
+            print(f"✓ {len(transitions)} phase transitions processed")
+    finally:
+        scheduler.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
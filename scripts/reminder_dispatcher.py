@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+Reminder dispatcher for note event dates and city events.
+
+notes.event_date and events.start_time exist but nothing reminds users
+ahead of them, and a full-table poll every minute would not scale. This
+engine loads upcoming deadlines in keyset-paginated windows (using
+idx_notes_event_date) into a hierarchical timing wheel, fires due reminders
+in batches, and applies note edits/deletes incrementally. Per-tick cost
+depends on the reminders due, not on the total number of notes.
+
+Every delivered reminder is recorded in reminder_deliveries (see migration
+20251202060000_reminder_deliveries.sql) under a key that includes the
+deadline, so a restart does not resend reminders already delivered, while a
+rescheduled note still gets fresh ones. Runs against Postgres via --dsn /
+$DATABASE_URL (psycopg, imported lazily), or a local SQLite stand-in.
+
+Clocks are injectable; SimulatedClock drives tests and dry runs
+(scripts/test_reminder_dispatcher.py).
+
+Usage:
+  python scripts/reminder_dispatcher.py [--dsn DSN | --db PATH] [--once] [--interval 60]
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+DEFAULT_DB = Path('.cache/reminders.sqlite')
+TICK_SECONDS = 60
+WHEEL_SLOTS = 64
+WHEEL_LEVELS = 4
+LEAD_TIMES = (timedelta(days=1), timedelta(hours=1))
+LOAD_HORIZON = timedelta(hours=6)
+PAGE_SIZE = 1000
+BATCH_SIZE = 500
+# Sorts before any uuid, so the first keyset page includes ties on the timestamp
+MIN_ID = '00000000-0000-0000-0000-000000000000'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS notes (
+    id text PRIMARY KEY,
+    user_id text NOT NULL,
+    title text,
+    event_date text
+);
+CREATE INDEX IF NOT EXISTS idx_notes_event_date ON notes(event_date, id);
+CREATE TABLE IF NOT EXISTS events (
+    id text PRIMARY KEY,
+    city_id text NOT NULL,
+    title text NOT NULL,
+    start_time text NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_events_start_time ON events(start_time, id);
+CREATE TABLE IF NOT EXISTS reminder_deliveries (
+    reminder_key text PRIMARY KEY,
+    sent_at text NOT NULL
+);
+"""
+
+
+class SystemClock:
+    def now(self):
+        return datetime.now(timezone.utc)
+
+
+class SimulatedClock:
+    def __init__(self, start):
+        self.current = start
+
+    def now(self):
+        return self.current
+
+    def advance(self, delta):
+        self.current += delta
+        return self.current
+
+
+def to_iso(moment):
+    return moment.astimezone(timezone.utc).isoformat()
+
+
+def from_iso(value):
+    # psycopg already returns timestamptz columns as datetimes
+    moment = value if isinstance(value, datetime) else datetime.fromisoformat(value.replace('Z', '+00:00'))
+    return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+
+
+class TimingWheel:
+    """
+    Hierarchical timing wheel keyed by integer ticks. Level 0 holds items due
+    within WHEEL_SLOTS ticks, level n within WHEEL_SLOTS ** (n + 1); higher
+    levels cascade down as the wheel turns. Anything beyond the top level
+    waits in an overflow list.
+    """
+
+    def __init__(self, start_tick, slots=WHEEL_SLOTS, levels=WHEEL_LEVELS):
+        self.slots = slots
+        self.levels = levels
+        self.current = start_tick
+        self.wheels = [[{} for _ in range(slots)] for _ in range(levels)]
+        self.overflow = {}
+        self.expired = {}
+        self.index = {}
+
+    def __len__(self):
+        return len(self.index)
+
+    def schedule(self, key, due_tick, item):
+        self.cancel(key)
+        self._place(key, due_tick, item)
+
+    def _place(self, key, due_tick, item):
+        delta = due_tick - self.current
+        if delta <= 0:
+            bucket = self.expired
+        else:
+            bucket = self.overflow
+            for level in range(self.levels):
+                if delta < self.slots ** (level + 1):
+                    bucket = self.wheels[level][(due_tick // self.slots ** level) % self.slots]
+                    break
+        bucket[key] = (due_tick, item)
+        self.index[key] = bucket
+
+    def cancel(self, key):
+        bucket = self.index.pop(key, None)
+        if bucket is not None:
+            bucket.pop(key, None)
+
+    def advance(self, target_tick):
+        """Move to target_tick and return [(due_tick, key, item)] for everything due"""
+        due = [(t, k, i) for k, (t, i) in self.expired.items()]
+        self.expired.clear()
+
+        while self.current < target_tick:
+            if not self.index:
+                # Empty wheel: nothing to cascade, jump straight to the target
+                self.current = target_tick
+                break
+            self.current += 1
+            for level in range(1, self.levels):
+                span = self.slots ** level
+                if self.current % span:
+                    break
+                self._cascade(self.wheels[level][(self.current // span) % self.slots])
+            if self.current % self.slots ** self.levels == 0:
+                self._cascade(self.overflow)
+            slot = self.wheels[0][self.current % self.slots]
+            due.extend((t, k, i) for k, (t, i) in slot.items())
+            slot.clear()
+
+        for _, key, _ in due:
+            self.index.pop(key, None)
+        due.extend((t, k, i) for k, (t, i) in self.expired.items())
+        for key in self.expired:
+            self.index.pop(key, None)
+        self.expired.clear()
+        return sorted(due, key=lambda d: d[0])
+
+    def _cascade(self, bucket):
+        items = list(bucket.items())
+        bucket.clear()
+        for key, (due_tick, item) in items:
+            self._place(key, due_tick, item)
+
+
+class ReminderDispatcher:
+    def __init__(self, conn, deliver, clock=None, lead_times=LEAD_TIMES,
+                 horizon=LOAD_HORIZON, page_size=PAGE_SIZE, batch_size=BATCH_SIZE):
+        self.conn = conn
+        self.deliver = deliver
+        self.clock = clock or SystemClock()
+        self.lead_times = lead_times
+        self.horizon = horizon
+        self.page_size = page_size
+        self.batch_size = batch_size
+        now = self.clock.now()
+        self.wheel = TimingWheel(self._tick(now))
+        self.loaded_until = now
+        self.by_source = {}
+
+    def _tick(self, moment):
+        return int(moment.timestamp()) // TICK_SECONDS
+
+    def _schedule_source(self, kind, source_id, start, audience, title):
+        """(Re)schedule every lead-time reminder for one note or event"""
+        source_key = (kind, source_id)
+        for key in self.by_source.pop(source_key, ()):
+            self.wheel.cancel(key)
+
+        now = self.clock.now()
+        if start <= now:
+            return
+        keys = []
+        shortest = min(self.lead_times)
+        for lead in self.lead_times:
+            due = start - lead
+            # Missed leads are skipped, but the shortest one still fires late;
+            # reminder_deliveries keeps a restart from firing it a second time
+            if due < now and lead != shortest:
+                continue
+            key = f'{kind}:{source_id}:{int(lead.total_seconds())}'
+            self.wheel.schedule(key, self._tick(due), {
+                'kind': kind, 'source_id': source_id, 'audience': audience,
+                'title': title, 'starts_at': to_iso(start), 'lead_seconds': int(lead.total_seconds()),
+                'reminder_key': f'{key}:{to_iso(start)}',
+            })
+            keys.append(key)
+        if keys:
+            self.by_source[source_key] = keys
+
+    def _pages(self, sql, window_start, window_end):
+        """Keyset pagination over (timestamp, id) within [window_start, window_end)"""
+        cursor = (to_iso(window_start), MIN_ID)
+        while True:
+            rows = self.conn.execute(sql, (*cursor, to_iso(window_end), self.page_size)).fetchall()
+            if not rows:
+                return
+            yield rows
+            if len(rows) < self.page_size:
+                return
+            cursor = (rows[-1][1], rows[-1][0])
+
+    def load_window(self):
+        """Pull deadlines that now fall inside the horizon (plus the longest lead)"""
+        now = self.clock.now()
+        window_end = now + self.horizon + max(self.lead_times)
+        if window_end <= self.loaded_until:
+            return 0
+        loaded = 0
+        for rows in self._pages(
+                """SELECT id, event_date, user_id, title FROM notes
+                   WHERE event_date IS NOT NULL AND (event_date, id) > (?, ?) AND event_date < ?
+                   ORDER BY event_date, id LIMIT ?""", self.loaded_until, window_end):
+            for note_id, event_date, user_id, title in rows:
+                self._schedule_source('note', str(note_id), from_iso(event_date), {'user_id': str(user_id)}, title)
+            loaded += len(rows)
+        for rows in self._pages(
+                """SELECT id, start_time, city_id, title FROM events
+                   WHERE (start_time, id) > (?, ?) AND start_time < ?
+                   ORDER BY start_time, id LIMIT ?""", self.loaded_until, window_end):
+            for event_id, start_time, city_id, title in rows:
+                self._schedule_source('event', str(event_id), from_iso(start_time), {'city_id': city_id}, title)
+            loaded += len(rows)
+        self.loaded_until = window_end
+        return loaded
+
+    def note_changed(self, note_id, user_id, title, event_date):
+        """Apply a note insert/update; only touches the wheel if inside the loaded window"""
+        if event_date is None:
+            self.note_deleted(note_id)
+            return
+        start = from_iso(event_date) if isinstance(event_date, str) else event_date
+        if start < self.loaded_until:
+            self._schedule_source('note', note_id, start, {'user_id': user_id}, title)
+        else:
+            self.note_deleted(note_id)
+
+    def note_deleted(self, note_id):
+        for key in self.by_source.pop(('note', note_id), ()):
+            self.wheel.cancel(key)
+
+    def tick(self):
+        """Load the next window if needed, then deliver everything due in batches"""
+        self.load_window()
+        due = self.wheel.advance(self._tick(self.clock.now()))
+        reminders = [item for _, _, item in due]
+        for item in reminders:
+            source_key = (item['kind'], item['source_id'])
+            remaining = [k for k in self.by_source.get(source_key, ()) if k in self.wheel.index]
+            if remaining:
+                self.by_source[source_key] = remaining
+            else:
+                self.by_source.pop(source_key, None)
+        delivered = 0
+        for start in range(0, len(reminders), self.batch_size):
+            delivered += self._deliver_once(reminders[start:start + self.batch_size])
+        # End the read transaction so a long-running loop never sits idle in one
+        self.conn.commit()
+        return delivered
+
+    def _deliver_once(self, batch):
+        """Deliver the reminders not already recorded as sent, then record them"""
+        keys = [r['reminder_key'] for r in batch]
+        sent = {row[0] for row in self.conn.execute(
+            f"SELECT reminder_key FROM reminder_deliveries WHERE reminder_key IN ({', '.join('?' * len(keys))})",
+            keys).fetchall()}
+        batch = [r for r in batch if r['reminder_key'] not in sent]
+        if not batch:
+            return 0
+        self.deliver(batch)
+        sent_at = to_iso(self.clock.now())
+        for r in batch:
+            self.conn.execute(
+                "INSERT INTO reminder_deliveries (reminder_key, sent_at) VALUES (?, ?) ON CONFLICT DO NOTHING",
+                (r['reminder_key'], sent_at))
+        self.conn.commit()
+        return len(batch)
+
+
+class Database:
+    """Thin DB-API wrapper so the same SQL runs on SQLite and psycopg"""
+
+    def __init__(self, conn, is_postgres):
+        self.conn = conn
+        self.is_postgres = is_postgres
+
+    def execute(self, sql, params=()):
+        if self.is_postgres:
+            sql = sql.replace('?', '%s')
+        cur = self.conn.cursor()
+        cur.execute(sql, params)
+        return cur
+
+    def commit(self):
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+def connect(db_path=DEFAULT_DB, dsn=None):
+    if dsn:
+        import psycopg
+        return Database(psycopg.connect(dsn), is_postgres=True)
+    if str(db_path) != ':memory:':
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(db_path))
+    conn.executescript(SCHEMA)
+    return Database(conn, is_postgres=False)
+
+
+def print_batch(batch):
+    for r in batch:
+        who = r['audience'].get('user_id') or f"city:{r['audience'].get('city_id')}"
+        print(f"🔔 {who}: {r['title']} at {r['starts_at']} ({r['lead_seconds'] // 60} min ahead)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', default=str(DEFAULT_DB), help='SQLite stand-in (used when no DSN is set)')
+    parser.add_argument('--dsn', help='Postgres DSN (default: $DATABASE_URL)')
+    parser.add_argument('--once', action='store_true', help='Run a single tick and exit')
+    parser.add_argument('--interval', type=float, default=TICK_SECONDS)
+    args = parser.parse_args()
+
+    conn = connect(args.db, args.dsn or os.environ.get('DATABASE_URL'))
+    try:
+        dispatcher = ReminderDispatcher(conn, print_batch)
+        while True:
+            fired = dispatcher.tick()
+            if args.once:
+                print(f"✓ Dispatched {fired} reminders ({len(dispatcher.wheel)} pending)")
+                return 0
+            time.sleep(args.interval)
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,6 +1,8 @@
 import json
 from pathlib import Path
 
+from city_registry import CityRegistry, task_cities
+
 def restore_config():
     file_path = Path('config/move2germany_tasks_v1.json')
     
@@ -14,13 +16,7 @@ def restore_config():
 
     # Reconstruct the full config structure
     full_config = {
-        "cities": [
-            {"id": "aachen", "name": "Aachen"},
-            {"id": "berlin", "name": "Berlin"},
-            {"id": "munich", "name": "Munich"},
-            {"id": "frankfurt", "name": "Frankfurt"},
-            {"id": "hamburg", "name": "Hamburg"}
-        ],
+        "cities": task_cities(CityRegistry.load(), tasks),
         "timeWindows": [
             {"id": "pre_arrival", "label": "Pre-arrival (0-3 months before)"},
             {"id": "week_1", "label": "Week 1"},
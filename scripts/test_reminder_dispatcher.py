@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Tests for the reminder dispatcher, driven by SimulatedClock.
+
+Usage:
+  python -m pytest scripts/test_reminder_dispatcher.py
+  python scripts/test_reminder_dispatcher.py
+"""
+import sys
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from reminder_dispatcher import ReminderDispatcher, SimulatedClock, TimingWheel, connect, to_iso  # noqa: E402
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+class TimingWheelTest(unittest.TestCase):
+    def fire_ticks(self, wheel, until):
+        """Advance one tick at a time and return {key: tick it fired on}"""
+        fired = {}
+        while wheel.current < until:
+            target = wheel.current + 1
+            for due_tick, key, _ in wheel.advance(target):
+                self.assertEqual(due_tick, target, key)
+                fired[key] = target
+        return fired
+
+    def test_cascades_every_level_and_overflow(self):
+        wheel = TimingWheel(0, slots=4, levels=2)
+        due = {'l0': 3, 'l1': 9, 'l1-edge': 15, 'overflow': 37}
+        for key, tick in due.items():
+            wheel.schedule(key, tick, None)
+        self.assertIn('overflow', wheel.overflow)
+
+        self.assertEqual(self.fire_ticks(wheel, 40), due)
+        self.assertEqual(len(wheel), 0)
+
+    def test_jump_returns_everything_due(self):
+        wheel = TimingWheel(0, slots=4, levels=2)
+        for key, tick in {'a': 2, 'b': 11, 'c': 30}.items():
+            wheel.schedule(key, tick, None)
+
+        self.assertEqual([k for _, k, _ in wheel.advance(20)], ['a', 'b'])
+        self.assertEqual(len(wheel), 1)
+
+    def test_cancel_and_reschedule(self):
+        wheel = TimingWheel(0, slots=4, levels=2)
+        wheel.schedule('gone', 5, None)
+        wheel.schedule('moved', 6, None)
+        wheel.cancel('gone')
+        wheel.schedule('moved', 12, None)
+
+        self.assertEqual(self.fire_ticks(wheel, 20), {'moved': 12})
+
+    def test_past_due_fires_on_next_advance(self):
+        wheel = TimingWheel(10)
+        wheel.schedule('late', 7, None)
+
+        self.assertEqual([k for _, k, _ in wheel.advance(10)], ['late'])
+
+
+class ReminderDispatcherTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = SimulatedClock(START)
+        self.conn = connect(':memory:')
+        self.sent = []
+
+    def dispatcher(self):
+        return ReminderDispatcher(self.conn, self.sent.extend, clock=self.clock)
+
+    def add_note(self, note_id, event_date):
+        self.conn.execute("INSERT INTO notes (id, user_id, title, event_date) VALUES (?, 'u1', ?, ?)",
+                          (note_id, f'Note {note_id}', to_iso(event_date)))
+        self.conn.commit()
+
+    def run_for(self, dispatcher, duration, step=timedelta(minutes=1)):
+        end = self.clock.now() + duration
+        while self.clock.now() < end:
+            self.clock.advance(step)
+            dispatcher.tick()
+
+    def fired(self):
+        return [(r['source_id'], r['lead_seconds']) for r in self.sent]
+
+    def test_fires_each_lead_once_at_its_time(self):
+        self.add_note('n1', START + timedelta(days=2))
+        dispatcher = self.dispatcher()
+
+        self.run_for(dispatcher, timedelta(hours=23))
+        self.assertEqual(self.fired(), [])
+        self.run_for(dispatcher, timedelta(hours=1))
+        self.assertEqual(self.fired(), [('n1', 86400)])
+        self.run_for(dispatcher, timedelta(hours=24))
+        self.assertEqual(self.fired(), [('n1', 86400), ('n1', 3600)])
+
+    def test_restart_does_not_resend(self):
+        self.add_note('n1', START + timedelta(minutes=30))
+        dispatcher = self.dispatcher()
+        dispatcher.tick()
+        self.assertEqual(self.fired(), [('n1', 3600)])
+
+        self.clock.advance(timedelta(minutes=5))
+        self.dispatcher().tick()
+        self.assertEqual(self.fired(), [('n1', 3600)])
+
+    def test_note_changed_reschedules(self):
+        self.add_note('n1', START + timedelta(hours=3))
+        dispatcher = self.dispatcher()
+        dispatcher.tick()
+
+        dispatcher.note_changed('n1', 'u1', 'Moved', to_iso(START + timedelta(hours=5)))
+        self.run_for(dispatcher, timedelta(hours=3))
+        self.assertEqual(self.fired(), [])
+        self.run_for(dispatcher, timedelta(hours=1))
+        self.assertEqual(self.fired(), [('n1', 3600)])
+        self.assertEqual(self.sent[0]['title'], 'Moved')
+
+    def test_note_changed_outside_window_or_cleared_cancels(self):
+        self.add_note('n1', START + timedelta(hours=3))
+        self.add_note('n2', START + timedelta(hours=3))
+        dispatcher = self.dispatcher()
+        dispatcher.tick()
+
+        dispatcher.note_changed('n1', 'u1', 'Far', START + timedelta(days=30))
+        dispatcher.note_changed('n2', 'u1', 'Cleared', None)
+        self.run_for(dispatcher, timedelta(hours=4))
+        self.assertEqual(self.fired(), [])
+        self.assertEqual(len(dispatcher.wheel), 0)
+
+    def test_note_changed_inside_window_schedules_new_note(self):
+        dispatcher = self.dispatcher()
+        dispatcher.tick()
+
+        dispatcher.note_changed('n3', 'u1', 'New', START + timedelta(hours=2))
+        self.run_for(dispatcher, timedelta(hours=1))
+        self.assertEqual(self.fired(), [('n3', 3600)])
+
+
+if __name__ == '__main__':
+    unittest.main()
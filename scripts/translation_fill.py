@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Batch translation fill for task overlays and UI locales.
+
+de.json covers a fraction of the UI keys and the German task overlay only a
+handful of tasks; gaps used to be filled by one-off update_*_i18n.py
+scripts. This pipeline:
+
+  1. collects every untranslated string in one pass: task titles,
+     descriptions, city notes and subtask titles missing from the
+     move2germany_tasks_<locale>_v1.json overlays, plus UI keys missing from
+     src/locales/<locale>.json and tasks.<locale>.json
+  2. resolves what it can from a translation memory built from the existing
+     tr/en/ar/de pairs: exact matches first, then fuzzy matches from a
+     character-trigram inverted index (Dice score >= --fuzzy-threshold)
+  3. sends only the remaining strings, batched per language pair, to a
+     pluggable translator backend
+  4. writes every touched overlay and locale file once
+
+Strings whose {placeholders} do not survive translation are rejected and
+reported rather than written. Fuzzy reuses are listed in the report for
+review.
+
+Translators: `stub` (local, tags output with the target locale; dry runs
+only, the default without --write) and `copy` (source text, what
+`m2g locale-sync --write` does), or any class given as `module:Class`
+exposing translate(texts, source, target) -> list[str]. --write requires an
+explicit translator other than `stub`.
+
+Usage:
+  python scripts/translation_fill.py [--locales de ar] [--translator module:Class] [--write] [--report PATH]
+"""
+import argparse
+import importlib
+import json
+import re
+import sys
+from collections import Counter
+from pathlib import Path
+
+from config_tools import (BASE_LOCALE, CONFIG_DIR, LOCALES_DIR, OVERLAY_LOCALES, TASKS_PATH, flatten_keys,
+                          load_json, overlay_path, save_json, set_key, sync_locale)
+
+TASK_SOURCE_LOCALE = 'tr'
+TASK_FIELDS = ('title', 'description', 'cityNote')
+UI_FILES = ('{locale}.json', 'tasks.{locale}.json')
+FUZZY_THRESHOLD = 0.9
+BATCH_SIZE = 50
+PLACEHOLDER_PATTERN = re.compile(r'\{\{?\s*\w+\s*\}?\}')
+
+
+def normalize(text):
+    return ' '.join(text.lower().split())
+
+
+def trigrams(text):
+    padded = f'  {normalize(text)} '
+    return Counter(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def placeholders(text):
+    return sorted(PLACEHOLDER_PATTERN.findall(text))
+
+
+class TranslationMemory:
+    """Aligned segments {locale: text} with an exact map and a trigram inverted index per locale"""
+
+    def __init__(self):
+        self.units = []
+        self.exact = {}
+        self.postings = {}
+        self.grams = []
+
+    def add(self, unit):
+        unit = {locale: text for locale, text in unit.items() if isinstance(text, str) and text.strip()}
+        if len(unit) < 2:
+            return
+        unit_id = len(self.units)
+        self.units.append(unit)
+        grams_by_locale = {}
+        for locale, text in unit.items():
+            self.exact.setdefault((locale, normalize(text)), []).append(unit_id)
+            grams_by_locale[locale] = trigrams(text)
+            for gram in grams_by_locale[locale]:
+                self.postings.setdefault((locale, gram), []).append(unit_id)
+        self.grams.append(grams_by_locale)
+
+    def lookup(self, text, source, target, threshold=FUZZY_THRESHOLD):
+        """Return (translation, score) from the best unit that has `target`, or (None, 0)"""
+        for unit_id in self.exact.get((source, normalize(text)), ()):
+            if target in self.units[unit_id]:
+                return self.units[unit_id][target], 1.0
+        if threshold >= 1.0:
+            return None, 0.0
+
+        query = trigrams(text)
+        query_size = sum(query.values())
+        shared = Counter()
+        for gram in query:
+            for unit_id in self.postings.get((source, gram), ()):
+                shared[unit_id] += 1
+        # Dice >= threshold needs at least threshold * |query| / 2 shared trigrams
+        min_shared = threshold * len(query) / 2
+        best, best_score = None, 0.0
+        for unit_id, overlap in shared.items():
+            unit = self.units[unit_id]
+            if overlap < min_shared or target not in unit:
+                continue
+            unit_grams = self.grams[unit_id][source]
+            common = sum(min(count, unit_grams[gram]) for gram, count in query.items() if gram in unit_grams)
+            score = 2 * common / (query_size + sum(unit_grams.values()))
+            if score > best_score:
+                best, best_score = unit[target], score
+        if best_score >= threshold:
+            return best, best_score
+        return None, best_score
+
+
+def _first_tasks(tasks):
+    """Loader semantics: the first task with a given id wins"""
+    seen = {}
+    for task in tasks:
+        seen.setdefault(task['id'], task)
+    return seen
+
+
+def _task_segments(task):
+    """Yield (segment key, text) for the translatable fields of one task entry"""
+    for field in TASK_FIELDS:
+        if task.get(field):
+            yield field, task[field]
+    for subtask in task.get('subtasks') or []:
+        if subtask.get('title'):
+            yield f"subtasks.{subtask['id']}.title", subtask['title']
+
+
+def build_memory(config, overlays, ui_catalogs):
+    """TM from the base config + overlays (aligned by task/segment) and UI files (aligned by key)"""
+    memory = TranslationMemory()
+    base_tasks = _first_tasks(config['tasks'])
+    overlay_maps = {locale: _first_tasks(entries) for locale, entries in overlays.items()}
+    for task_id, task in base_tasks.items():
+        for segment, text in _task_segments(task):
+            unit = {TASK_SOURCE_LOCALE: text}
+            for locale, entries in overlay_maps.items():
+                translated = dict(_task_segments(entries.get(task_id, {}))).get(segment)
+                if translated:
+                    unit[locale] = translated
+            memory.add(unit)
+    for pattern, catalogs in ui_catalogs.items():
+        flat = {locale: flatten_keys(data) for locale, data in catalogs.items()}
+        for key in set().union(*(f.keys() for f in flat.values())):
+            memory.add({locale: values.get(key) for locale, values in flat.items()})
+    return memory
+
+
+def missing_task_segments(config, overlay, source_overlay):
+    """[(task_id, segment, source_text, source_locale)] missing from one overlay"""
+    overlay_map = _first_tasks(overlay)
+    source_map = _first_tasks(source_overlay) if source_overlay is not None else {}
+    missing = []
+    for task_id, task in _first_tasks(config['tasks']).items():
+        have = dict(_task_segments(overlay_map.get(task_id, {})))
+        source = dict(_task_segments(source_map.get(task_id, {})))
+        for segment, base_text in _task_segments(task):
+            if segment not in have:
+                missing.append((task_id, segment, source.get(segment) or base_text,
+                                'en' if segment in source else TASK_SOURCE_LOCALE))
+    return missing
+
+
+def apply_task_segment(overlay, config_task, segment, text):
+    entry = next((e for e in overlay if e['id'] == config_task['id']), None)
+    if entry is None:
+        entry = {'id': config_task['id']}
+        overlay.append(entry)
+    if not segment.startswith('subtasks.'):
+        entry[segment] = text
+        return
+    subtask_id = segment.split('.')[1]
+    subtasks = entry.setdefault('subtasks', [])
+    sub = next((s for s in subtasks if s['id'] == subtask_id), None)
+    if sub is None:
+        subtasks.append({'id': subtask_id, 'title': text})
+    else:
+        sub['title'] = text
+
+
+class StubTranslator:
+    """Local stand-in: tags the source text so unreviewed output is easy to find"""
+
+    writable = False
+
+    def translate(self, texts, source, target):
+        return [f'[{target}] {text}' for text in texts]
+
+
+class CopyTranslator:
+    def translate(self, texts, source, target):
+        return list(texts)
+
+
+TRANSLATORS = {'stub': StubTranslator, 'copy': CopyTranslator}
+
+
+def load_translator(spec):
+    if spec in TRANSLATORS:
+        return TRANSLATORS[spec]()
+    module_name, _, class_name = spec.partition(':')
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+def resolve(requests, memory, translator, fuzzy_threshold=FUZZY_THRESHOLD, batch_size=BATCH_SIZE):
+    """
+    requests: {request_key: (text, source, target)}. Returns
+    ({request_key: text}, {request_key: (how, score)}) where how is
+    exact / fuzzy / translated / rejected.
+    """
+    resolved, provenance = {}, {}
+    remaining = {}
+    for key, (text, source, target) in requests.items():
+        match, score = memory.lookup(text, source, target, fuzzy_threshold)
+        if match is not None and placeholders(match) == placeholders(text):
+            resolved[key] = match
+            provenance[key] = ('exact' if score == 1.0 else 'fuzzy', round(score, 3))
+        else:
+            remaining.setdefault((source, target), []).append((key, text))
+
+    for (source, target), items in remaining.items():
+        for start in range(0, len(items), batch_size):
+            batch = items[start:start + batch_size]
+            outputs = translator.translate([text for _, text in batch], source, target)
+            for (key, text), output in zip(batch, outputs):
+                if output and placeholders(output) == placeholders(text):
+                    resolved[key] = output
+                    provenance[key] = ('translated', None)
+                else:
+                    provenance[key] = ('rejected', None)
+    return resolved, provenance
+
+
+def fill(locales, translator, fuzzy_threshold=FUZZY_THRESHOLD, write=False,
+         config_dir=CONFIG_DIR, locales_dir=LOCALES_DIR, tasks_path=TASKS_PATH):
+    config = load_json(tasks_path)
+    overlay_locales = sorted(set(OVERLAY_LOCALES) | set(locales))
+    overlays = {code: load_json(overlay_path(code, config_dir)) if overlay_path(code, config_dir).exists() else []
+                for code in overlay_locales}
+    ui_catalogs = {}
+    for pattern in UI_FILES:
+        ui_catalogs[pattern] = {}
+        for path in sorted(Path(locales_dir).glob(pattern.format(locale='*'))):
+            code = path.stem.split('.')[-1]
+            if pattern.format(locale=code) == path.name:
+                ui_catalogs[pattern][code] = load_json(path)
+        for code in locales:
+            ui_catalogs[pattern].setdefault(code, {})
+
+    memory = build_memory(config, overlays, ui_catalogs)
+    base_tasks = _first_tasks(config['tasks'])
+
+    # 1. Collect every missing string across all targets
+    requests = {}
+    for code in locales:
+        if code != TASK_SOURCE_LOCALE:
+            source_overlay = overlays.get('en') if code != 'en' else None
+            for task_id, segment, text, source in missing_task_segments(config, overlays[code], source_overlay):
+                requests[('task', code, task_id, segment)] = (text, source, code)
+        for pattern in UI_FILES:
+            base = flatten_keys(ui_catalogs[pattern].get(BASE_LOCALE, {}))
+            have = flatten_keys(ui_catalogs[pattern][code])
+            for key, text in base.items():
+                if key not in have and isinstance(text, str):
+                    requests[('ui', code, pattern, key)] = (text, BASE_LOCALE, code)
+
+    # 2-3. Translation memory first, translator for the rest
+    resolved, provenance = resolve(requests, memory, translator, fuzzy_threshold)
+
+    # 4. Apply and write each file once
+    report = {'locales': {}, 'fuzzy': [], 'rejected': [], 'conflicts': []}
+    for code in locales:
+        counts = Counter(how for key, (how, _) in provenance.items() if key[1] == code)
+        report['locales'][code] = {'missing': sum(1 for key in requests if key[1] == code), **counts}
+        touched_overlay = False
+        for key, text in resolved.items():
+            if key[0] == 'task' and key[1] == code:
+                apply_task_segment(overlays[code], base_tasks[key[2]], key[3], text)
+                touched_overlay = True
+        if touched_overlay and write:
+            save_json(overlay_path(code, config_dir), overlays[code])
+        for pattern in UI_FILES:
+            values = {key[3]: text for key, text in resolved.items()
+                      if key[0] == 'ui' and key[1] == code and key[2] == pattern}
+            if not values:
+                continue
+            target = ui_catalogs[pattern][code]
+            # Only the resolved keys go through sync_locale; rejected ones stay missing
+            resolved_base = {}
+            for key in values:
+                set_key(resolved_base, key, key)
+            _, conflicts = sync_locale(resolved_base, target, fill=lambda key, _: values[key])
+            report['conflicts'].extend(f'{pattern.format(locale=code)}:{k}' for k in conflicts)
+            if write:
+                save_json(Path(locales_dir) / pattern.format(locale=code), target)
+
+    for key, (how, score) in sorted(provenance.items(), key=lambda item: str(item[0])):
+        label = f'{key[2].format(locale=key[1])}:{key[3]}' if key[0] == 'ui' else f'{key[1]}:{key[2]}:{key[3]}'
+        if how == 'fuzzy':
+            report['fuzzy'].append({'key': label, 'score': score, 'source': requests[key][0], 'text': resolved[key]})
+        elif how == 'rejected':
+            report['rejected'].append({'key': label, 'source': requests[key][0]})
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--locales', nargs='+', default=['en', 'ar', 'de'], help='Target locales (new ones allowed)')
+    parser.add_argument('--translator', help="stub (default for dry runs), copy, or module:Class")
+    parser.add_argument('--fuzzy-threshold', type=float, default=FUZZY_THRESHOLD,
+                        help='Minimum trigram Dice score to reuse a fuzzy match (1.0 = exact only)')
+    parser.add_argument('--write', action='store_true', help='Write overlays and locale files (default: dry run)')
+    parser.add_argument('--report', help='Write the full JSON report here')
+    args = parser.parse_args(argv)
+
+    if args.write and args.translator is None:
+        print("✗ --write needs an explicit --translator (copy or module:Class)", file=sys.stderr)
+        return 1
+    translator = load_translator(args.translator or 'stub')
+    if args.write and not getattr(translator, 'writable', True):
+        print(f"✗ Refusing to write '{args.translator}' output; use copy or module:Class", file=sys.stderr)
+        return 1
+
+    report = fill(args.locales, translator, args.fuzzy_threshold, args.write)
+    for code, counts in report['locales'].items():
+        print(f"{'✓' if args.write else '•'} {code}: {counts['missing']} missing → "
+              f"{counts.get('exact', 0)} exact, {counts.get('fuzzy', 0)} fuzzy, "
+              f"{counts.get('translated', 0)} translated, {counts.get('rejected', 0)} rejected")
+    for item in report['conflicts']:
+        print(f"⚠ {item} conflicts with a string value, skipped")
+    if report['fuzzy']:
+        print(f"⚠ {len(report['fuzzy'])} fuzzy matches to review{' (see report)' if args.report else ''}")
+    if args.report:
+        Path(args.report).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.report).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding='utf-8')
+    if not args.write:
+        print("(dry run; pass --write to update files)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,5 +1,5 @@
 import { useState, useEffect } from 'react';
-import { getTopics, type Topic } from '../../lib/community';
+import { getTopics, TOPICS_PAGE_SIZE, type Topic } from '../../lib/community';
 import { useAuth } from '../../contexts/AuthContext';
 import { MessageSquare, User, Clock, Plus } from 'lucide-react';
 import { formatDistanceToNow } from 'date-fns';
@@ -20,6 +20,8 @@ export function TopicList({ onSelectTopic, onCreateTopic }: TopicListProps) {
     const { t } = useI18n();
     const [topics, setTopics] = useState<Topic[]>([]);
     const [loading, setLoading] = useState(true);
+    const [loadingMore, setLoadingMore] = useState(false);
+    const [hasMore, setHasMore] = useState(false);
 
     useEffect(() => {
         loadTopics();
@@ -30,6 +32,7 @@ export function TopicList({ onSelectTopic, onCreateTopic }: TopicListProps) {
         try {
             const data = await getTopics(user.primaryCityId || 'berlin');
             setTopics(data);
+            setHasMore(data.length === TOPICS_PAGE_SIZE);
         } catch (error) {
             console.error('Failed to load topics:', error);
             toast.error(t('community.forum.error.loadTopics'));
@@ -38,6 +41,24 @@ export function TopicList({ onSelectTopic, onCreateTopic }: TopicListProps) {
         }
     }
 
+    async function loadMoreTopics() {
+        if (!user || topics.length === 0) return;
+        const last = topics[topics.length - 1];
+        setLoadingMore(true);
+        try {
+            const data = await getTopics(user.primaryCityId || 'berlin', undefined, {
+                before: { created_at: last.created_at, id: last.id }
+            });
+            setTopics(prev => [...prev, ...data]);
+            setHasMore(data.length === TOPICS_PAGE_SIZE);
+        } catch (error) {
+            console.error('Failed to load topics:', error);
+            toast.error(t('community.forum.error.loadTopics'));
+        } finally {
+            setLoadingMore(false);
+        }
+    }
+
     if (loading) {
         return (
             <div className="space-y-4">
@@ -114,6 +135,13 @@ export function TopicList({ onSelectTopic, onCreateTopic }: TopicListProps) {
                             </div>
                         </Card>
                     ))}
+                    {hasMore && (
+                        <div className="flex justify-center pt-2">
+                            <Button variant="outline" onClick={loadMoreTopics} isLoading={loadingMore}>
+                                {t('community.forum.loadMore')}
+                            </Button>
+                        </div>
+                    )}
                 </div>
             )}
         </div>
@@ -1,6 +1,6 @@
 import { useState, useEffect } from 'react';
 import { ExternalLink, FileText, Sparkles, Check, Copy } from 'lucide-react';
-import { Task, TaskActionLink } from '../../lib/config';
+import { Task, TaskActionLink, cityInScope } from '../../lib/config';
 import { useI18n } from '../../contexts/I18nContext';
 import { useAuth } from '../../contexts/AuthContext';
 import { getUserTaskDocuments, toggleTaskDocument } from '../../lib/documents';
@@ -106,7 +106,7 @@ export function ActionBlock({ task, userCity, metadata }: ActionBlockProps) {
 
     return links.filter(link => {
       if (!link.cityScope || link.cityScope.length === 0) return true;
-      return link.cityScope.includes(userCity);
+      return cityInScope(link.cityScope, userCity);
     });
   }
 
@@ -79,7 +79,7 @@ export async function sendMessage(
       content: message
     });
 
-  const history = await getConversationHistory(convId);
+  const { summary, messages: history } = await getConversationHistory(convId);
 
   const contextInfo = await buildContextInfo(context);
 
@@ -104,14 +104,19 @@ export async function sendMessage(
     return { response: mockResponse, conversationId: convId };
   }
 
+  // Chat history must open with a user turn; the window may start mid-exchange
+  const priorTurns = history.slice(0, -1);
+  const firstUserTurn = priorTurns.findIndex(msg => msg.role === 'user');
+
   const chat = model.startChat({
-    history: history.slice(0, -1).map(msg => ({
+    history: (firstUserTurn === -1 ? [] : priorTurns.slice(firstUserTurn)).map(msg => ({
       role: msg.role === 'assistant' ? 'model' : 'user',
       parts: [{ text: msg.content }]
     }))
   });
 
-  const prompt = `${contextInfo}\n\nUser: ${message}`;
+  const summaryInfo = summary ? `\n\n**Earlier in this conversation:**\n${summary}` : '';
+  const prompt = `${contextInfo}${summaryInfo}\n\nUser: ${message}`;
 
   let result = await chat.sendMessage(prompt);
   let response = result.response.text();
@@ -289,21 +294,36 @@ async function openContentTool(args: Record<string, unknown>): Promise<Record<st
   return { content };
 }
 
-async function getConversationHistory(conversationId: string): Promise<AiMessage[]> {
-  const { data, error } = await supabase
-    .from('ai_messages')
-    .select('*')
-    .eq('conversation_id', conversationId)
-    .order('created_at', { ascending: true });
+// Older turns are folded into ai_conversations.summary by
+// scripts/conversation_compaction.py, which leaves only the recent turns
+// uncompacted; every uncompacted message is loaded so none is dropped.
+async function getConversationHistory(
+  conversationId: string
+): Promise<{ summary: string | null; messages: AiMessage[] }> {
+  const [{ data: conversation }, { data, error }] = await Promise.all([
+    supabase
+      .from('ai_conversations')
+      .select('summary')
+      .eq('id', conversationId)
+      .maybeSingle(),
+    supabase
+      .from('ai_messages')
+      .select('role, content')
+      .eq('conversation_id', conversationId)
+      .eq('compacted', false)
+      .order('created_at', { ascending: true })
+  ]);
 
   if (error) {
     throw new Error(error.message);
   }
 
-  return (data || []).map(msg => ({
+  const messages = (data || []).map(msg => ({
     role: msg.role as 'user' | 'assistant' | 'system',
     content: msg.content
   }));
+
+  return { summary: conversation?.summary ?? null, messages };
 }
 
 export async function endConversation(conversationId: string): Promise<void> {
@@ -32,7 +32,8 @@ export async function signUp(email: string, password: string) {
     throw new Error('Failed to create user');
   }
 
-  await logAuditEvent(data.user.id, 'signup', { email });
+  // Fire-and-forget: the audit insert must not delay auth
+  void logAuditEvent(data.user.id, 'signup', { email });
 
   return data.user;
 }
@@ -51,7 +52,7 @@ export async function signIn(email: string, password: string) {
     throw new Error('Invalid credentials');
   }
 
-  await logAuditEvent(data.user.id, 'login', { email });
+  void logAuditEvent(data.user.id, 'login', { email });
 
   const profile = await getCurrentUser();
   return profile;
@@ -217,11 +218,15 @@ function mapUserToProfile(user: Record<string, unknown>): UserProfile {
 }
 
 export async function logAuditEvent(userId: string | null, eventType: string, payload: Record<string, unknown>) {
-  await supabase
+  const { error } = await supabase
     .from('audit_logs')
     .insert({
       user_id: userId,
       event_type: eventType,
       payload_json: payload
     });
+
+  if (error) {
+    console.warn('Failed to write audit event:', eventType, error.message);
+  }
 }
@@ -13,6 +13,7 @@ export type Topic = {
     deleted_at?: string;
     author?: { email: string }; // Joined data
     reply_count?: number;
+    last_activity_at?: string;
 };
 
 export type Reply = {
@@ -26,26 +27,39 @@ export type Reply = {
     author?: { email: string };
 };
 
-export async function getTopics(cityId: string, moduleId?: string) {
+export const TOPICS_PAGE_SIZE = 20;
+
+export type TopicCursor = Pick<Topic, 'created_at' | 'id'>;
+
+// Keyset pagination over (created_at, id); reply_count is kept on the topic
+// row by trigger, so no community_replies aggregate is needed per page.
+export async function getTopics(
+    cityId: string,
+    moduleId?: string,
+    options: { before?: TopicCursor; limit?: number } = {}
+) {
     let query = supabase
         .from('community_topics')
-        .select('*, author:users(email), replies:community_replies(count)')
+        .select('*, author:users(email)')
         .eq('city_id', cityId)
         .is('deleted_at', null)
-        .order('created_at', { ascending: false });
+        .order('created_at', { ascending: false })
+        .order('id', { ascending: false })
+        .limit(options.limit ?? TOPICS_PAGE_SIZE);
 
     if (moduleId) {
         query = query.eq('module_id', moduleId);
     }
 
+    if (options.before) {
+        const { created_at, id } = options.before;
+        query = query.or(`created_at.lt.${created_at},and(created_at.eq.${created_at},id.lt.${id})`);
+    }
+
     const { data, error } = await query;
     if (error) throw error;
 
-    // Format reply count
-    return data.map(topic => ({
-        ...topic,
-        reply_count: topic.replies?.[0]?.count || 0
-    })) as Topic[];
+    return data as Topic[];
 }
 
 export async function getTopic(id: string) {
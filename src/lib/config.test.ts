@@ -1,5 +1,5 @@
 import { describe, it, expect } from 'vitest';
-import { configLoader } from './config';
+import { configLoader, cityInScope, ALL_CITIES } from './config';
 
 describe('ConfigLoader', () => {
     it('should load German tasks when locale is de', () => {
@@ -32,3 +32,29 @@ describe('ConfigLoader', () => {
         expect(housingTask?.title).not.toBe('Wohnungssuche beginnen');
     });
 });
+
+describe('City scope', () => {
+    it('should match cities listed in the scope', () => {
+        expect(cityInScope(['berlin', 'munich'], 'berlin')).toBe(true);
+        expect(cityInScope(['berlin', 'munich'], 'hamburg')).toBe(false);
+    });
+
+    it('should match every city for the wildcard scope', () => {
+        expect(cityInScope([ALL_CITIES], 'berlin')).toBe(true);
+        expect(cityInScope([ALL_CITIES], 'not_a_registered_city')).toBe(true);
+    });
+
+    it('should include wildcard-scoped tasks when filtering by any city', () => {
+        const task = configLoader.getTasks('tr')[0];
+        const originalScope = task.cityScope;
+        try {
+            task.cityScope = ['berlin'];
+            expect(configLoader.filterTasks({ cityId: 'not_a_registered_city' }).map(t => t.id)).not.toContain(task.id);
+
+            task.cityScope = [ALL_CITIES];
+            expect(configLoader.filterTasks({ cityId: 'not_a_registered_city' }).map(t => t.id)).toContain(task.id);
+        } finally {
+            task.cityScope = originalScope;
+        }
+    });
+});
@@ -121,6 +121,13 @@ export type TaskDocumentChecklistItem = {
   required?: boolean;
 };
 
+// Wildcard city scope: applies to every city, including ones added later
+export const ALL_CITIES = '*';
+
+export function cityInScope(scope: string[], cityId: string): boolean {
+  return scope.includes(cityId) || scope.includes(ALL_CITIES);
+}
+
 type ActionBlocksConfig = {
   actionBlocks: Record<string, {
     actionLinks?: TaskActionLink[];
@@ -288,7 +295,7 @@ class ConfigLoader {
 
     if (filters.cityId) {
       filtered = filtered.filter(task =>
-        task.cityScope.includes(filters.cityId!)
+        cityInScope(task.cityScope, filters.cityId!)
       );
     }
 
@@ -10,6 +10,7 @@ export type Document = {
   mimeType: string;
   size: number;
   uploadedAt: string;
+  contentSha256: string | null;
 };
 
 const ALLOWED_MIME_TYPES = [
@@ -36,36 +37,18 @@ export async function uploadDocument(
     throw new Error('File size exceeds 10MB limit.');
   }
 
-  const fileExt = file.name.split('.').pop();
-  const fileName = `${userId}/${Date.now()}_${Math.random().toString(36).substring(7)}.${fileExt}`;
-
-  const { error: uploadError } = await supabase.storage
-    .from(BUCKET_NAME)
-    .upload(fileName, file, {
-      cacheControl: '3600',
-      upsert: false
-    });
-
-  if (uploadError) {
-    throw new Error(`Upload failed: ${uploadError.message}`);
+  // Hashing, blob storage and the documents row happen server-side so the
+  // client never chooses a blob key (supabase/functions/documents-upload)
+  const body = new FormData();
+  body.append('file', file);
+  if (taskId) {
+    body.append('taskId', taskId);
   }
 
-  const { data, error } = await supabase
-    .from('documents')
-    .insert({
-      user_id: userId,
-      task_id: taskId || null,
-      storage_key: fileName,
-      file_name: file.name,
-      mime_type: file.type,
-      size: file.size
-    })
-    .select()
-    .single();
+  const { data, error } = await supabase.functions.invoke('documents-upload', { body });
 
   if (error) {
-    await supabase.storage.from(BUCKET_NAME).remove([fileName]);
-    throw new Error(error.message);
+    throw new Error(`Upload failed: ${error.message}`);
   }
 
   await logAuditEvent(userId, 'document_upload', {
@@ -136,12 +119,15 @@ export async function deleteDocument(userId: string, documentId: string): Promis
     throw new Error('Document not found');
   }
 
-  const { error: storageError } = await supabase.storage
-    .from(BUCKET_NAME)
-    .remove([document.storageKey]);
+  // Content-addressed blobs are shared; the storage gc removes them once unreferenced
+  if (!document.contentSha256) {
+    const { error: storageError } = await supabase.storage
+      .from(BUCKET_NAME)
+      .remove([document.storageKey]);
 
-  if (storageError) {
-    console.error('Failed to delete file from storage:', storageError);
+    if (storageError) {
+      console.error('Failed to delete file from storage:', storageError);
+    }
   }
 
   const { error } = await supabase
@@ -164,7 +150,8 @@ function mapDbToDocument(data: Record<string, unknown>): Document {
     fileName: data.file_name as string,
     mimeType: data.mime_type as string,
     size: data.size as number,
-    uploadedAt: data.uploaded_at as string
+    uploadedAt: data.uploaded_at as string,
+    contentSha256: (data.content_sha256 as string | null) ?? null
   };
 }
 
@@ -1,6 +1,6 @@
 import { describe, it, expect } from 'vitest';
-import { getHousingLinks, generateHousingUrl } from './housing';
-import { HousingProvider } from './config';
+import { getHousingLinks, generateHousingUrl, getHousingProvidersForCity } from './housing';
+import { ALL_CITIES, HousingProvider, housingProviders } from './config';
 
 describe('Housing Logic', () => {
     it('should generate correct URL for WG-Gesucht in Berlin with city code', () => {
@@ -65,4 +65,22 @@ describe('Housing Logic', () => {
         const links = getHousingLinks('unknown_city');
         expect(links).toHaveLength(0);
     });
+
+    it('should return wildcard-scoped providers for every city', () => {
+        const provider: HousingProvider = {
+            id: 'test_nationwide',
+            cityIds: [ALL_CITIES],
+            type: 'apartment',
+            urlTemplate: 'https://test.com/search/{{citySlug}}',
+            labelKey: 'housing.providers.test',
+            enabled: true
+        };
+        housingProviders.push(provider);
+        try {
+            expect(getHousingProvidersForCity('unknown_city')).toEqual([provider]);
+            expect(getHousingProvidersForCity('berlin')).toContain(provider);
+        } finally {
+            housingProviders.splice(housingProviders.indexOf(provider), 1);
+        }
+    });
 });
@@ -1,4 +1,4 @@
-import { housingProviders, HousingProvider } from './config';
+import { cityInScope, housingProviders, HousingProvider } from './config';
 
 const CITY_CODES: Record<string, string> = {
     'aachen': '1',
@@ -32,7 +32,7 @@ export type HousingCriteria = {
 };
 
 export function getHousingProvidersForCity(cityId: string): HousingProvider[] {
-    return housingProviders.filter(p => p.enabled && p.cityIds.includes(cityId));
+    return housingProviders.filter(p => p.enabled && cityInScope(p.cityIds, cityId));
 }
 
 export function generateHousingUrl(
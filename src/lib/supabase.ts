@@ -56,8 +56,11 @@ export type Database = {
           mime_type: string;
           size: number;
           uploaded_at: string;
+          content_sha256: string | null;
+        };
+        Insert: Omit<Database['public']['Tables']['documents']['Row'], 'id' | 'uploaded_at' | 'content_sha256'> & {
+          content_sha256?: string | null;
         };
-        Insert: Omit<Database['public']['Tables']['documents']['Row'], 'id' | 'uploaded_at'>;
         Update: Partial<Database['public']['Tables']['documents']['Insert']>;
       };
       ai_conversations: {
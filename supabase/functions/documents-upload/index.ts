@@ -0,0 +1,127 @@
+import { createClient } from 'https://esm.sh/@supabase/supabase-js@2'
+import { corsHeaders } from '../_shared/cors.ts'
+
+// Server-side upload path for the content-addressed document store
+// (migration 20251202040000_document_blobs.sql). The file is hashed here, not
+// by the browser, so a client can never write or claim a blob key whose bytes
+// do not match its sha256. Mirrors DocumentStore.put in scripts/document_store.py.
+
+const SUPABASE_URL = Deno.env.get('SUPABASE_URL')
+const SUPABASE_ANON_KEY = Deno.env.get('SUPABASE_ANON_KEY')
+const SUPABASE_SERVICE_ROLE_KEY = Deno.env.get('SUPABASE_SERVICE_ROLE_KEY')
+
+const BUCKET_NAME = 'documents'
+const ALLOWED_MIME_TYPES = ['application/pdf', 'image/jpeg', 'image/jpg', 'image/png']
+const MAX_FILE_SIZE = 10 * 1024 * 1024
+
+const admin = createClient(SUPABASE_URL || '', SUPABASE_SERVICE_ROLE_KEY || '')
+
+function json(body: unknown, status = 200) {
+    return new Response(JSON.stringify(body), {
+        status,
+        headers: { ...corsHeaders, 'Content-Type': 'application/json' },
+    })
+}
+
+function blobKey(sha256: string) {
+    return `blobs/${sha256.slice(0, 2)}/${sha256}`
+}
+
+async function sha256Hex(bytes: ArrayBuffer) {
+    const digest = await crypto.subtle.digest('SHA-256', bytes)
+    return Array.from(new Uint8Array(digest), b => b.toString(16).padStart(2, '0')).join('')
+}
+
+Deno.serve(async (req) => {
+    if (req.method === 'OPTIONS') {
+        return new Response('ok', { headers: corsHeaders })
+    }
+
+    try {
+        if (!SUPABASE_URL || !SUPABASE_ANON_KEY || !SUPABASE_SERVICE_ROLE_KEY) {
+            throw new Error('Server configuration error: Missing Supabase credentials')
+        }
+
+        // Resolve the caller from their own JWT; never trust a user id from the body
+        const caller = createClient(SUPABASE_URL, SUPABASE_ANON_KEY, {
+            global: { headers: { Authorization: req.headers.get('Authorization') || '' } },
+        })
+        const { data: { user }, error: authError } = await caller.auth.getUser()
+        if (authError || !user) {
+            return json({ error: 'Not authenticated' }, 401)
+        }
+
+        const form = await req.formData()
+        const file = form.get('file')
+        const taskId = form.get('taskId')
+        if (!(file instanceof File)) {
+            return json({ error: 'File is required' }, 400)
+        }
+        if (!ALLOWED_MIME_TYPES.includes(file.type)) {
+            return json({ error: 'Invalid file type. Only PDF, JPG, and PNG are allowed.' }, 400)
+        }
+        if (file.size > MAX_FILE_SIZE) {
+            return json({ error: 'File size exceeds 10MB limit.' }, 400)
+        }
+
+        const bytes = await file.arrayBuffer()
+        const sha256 = await sha256Hex(bytes)
+        const storageKey = blobKey(sha256)
+
+        const { data: blob, error: blobError } = await admin
+            .from('document_blobs')
+            .select('sha256')
+            .eq('sha256', sha256)
+            .maybeSingle()
+        if (blobError) {
+            throw blobError
+        }
+
+        const deduplicated = !!blob
+        if (!blob) {
+            const { error: uploadError } = await admin.storage
+                .from(BUCKET_NAME)
+                .upload(storageKey, bytes, { contentType: file.type, cacheControl: '3600', upsert: false })
+            // A concurrent upload of the same content already stored identical bytes
+            if (uploadError && !/exists/i.test(uploadError.message)) {
+                throw new Error(`Upload failed: ${uploadError.message}`)
+            }
+            // Born orphaned: if the reference below fails, gc reclaims the object;
+            // the ref_count trigger clears orphaned_at once a document points at it
+            const { error: insertBlobError } = await admin
+                .from('document_blobs')
+                .upsert({
+                    sha256,
+                    storage_key: storageKey,
+                    size: file.size,
+                    mime_type: file.type,
+                    orphaned_at: new Date().toISOString(),
+                }, { onConflict: 'sha256', ignoreDuplicates: true })
+            if (insertBlobError) {
+                throw insertBlobError
+            }
+        }
+
+        const { data, error } = await admin
+            .from('documents')
+            .insert({
+                user_id: user.id,
+                task_id: typeof taskId === 'string' && taskId ? taskId : null,
+                storage_key: storageKey,
+                file_name: file.name,
+                mime_type: file.type,
+                size: file.size,
+                content_sha256: sha256,
+            })
+            .select()
+            .single()
+        if (error) {
+            throw error
+        }
+
+        return json({ ...data, deduplicated })
+    } catch (error) {
+        console.error('documents-upload error:', error)
+        return json({ error: error.message }, 500)
+    }
+})
@@ -0,0 +1,65 @@
+-- Corpus version counter for the chat retrieval/answer cache.
+-- Any write to corpus rows of public.documents (user_id IS NULL: ingestion,
+-- re-embedding, cleanup) bumps the version, which makes every cached
+-- retrieval result stale automatically. User uploads share the table but are
+-- never retrieved by chat, so they leave the version (and the cache) alone.
+
+CREATE TABLE IF NOT EXISTS public.documents_version (
+    id boolean PRIMARY KEY DEFAULT true CHECK (id),
+    version bigint NOT NULL DEFAULT 0,
+    updated_at timestamptz DEFAULT now()
+);
+
+INSERT INTO public.documents_version (id, version) VALUES (true, 0)
+ON CONFLICT (id) DO NOTHING;
+
+CREATE OR REPLACE FUNCTION bump_documents_version()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+  -- Statement-level with transition tables: one check per statement, and only
+  -- statements that touched a corpus row bump the version
+  IF TG_OP = 'INSERT' THEN
+    IF NOT EXISTS (SELECT 1 FROM new_rows WHERE user_id IS NULL) THEN RETURN NULL; END IF;
+  ELSIF TG_OP = 'UPDATE' THEN
+    IF NOT EXISTS (SELECT 1 FROM old_rows WHERE user_id IS NULL)
+       AND NOT EXISTS (SELECT 1 FROM new_rows WHERE user_id IS NULL) THEN RETURN NULL; END IF;
+  ELSIF TG_OP = 'DELETE' THEN
+    IF NOT EXISTS (SELECT 1 FROM old_rows WHERE user_id IS NULL) THEN RETURN NULL; END IF;
+  END IF;
+  UPDATE documents_version SET version = version + 1, updated_at = now() WHERE id;
+  RETURN NULL;
+END;
+$$;
+
+-- Transition tables require one trigger per event
+DROP TRIGGER IF EXISTS trigger_bump_documents_version ON public.documents;
+DROP TRIGGER IF EXISTS trigger_bump_documents_version_insert ON public.documents;
+DROP TRIGGER IF EXISTS trigger_bump_documents_version_update ON public.documents;
+DROP TRIGGER IF EXISTS trigger_bump_documents_version_delete ON public.documents;
+DROP TRIGGER IF EXISTS trigger_bump_documents_version_truncate ON public.documents;
+CREATE TRIGGER trigger_bump_documents_version_insert
+  AFTER INSERT ON public.documents
+  REFERENCING NEW TABLE AS new_rows
+  FOR EACH STATEMENT
+  EXECUTE FUNCTION bump_documents_version();
+CREATE TRIGGER trigger_bump_documents_version_update
+  AFTER UPDATE ON public.documents
+  REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+  FOR EACH STATEMENT
+  EXECUTE FUNCTION bump_documents_version();
+CREATE TRIGGER trigger_bump_documents_version_delete
+  AFTER DELETE ON public.documents
+  REFERENCING OLD TABLE AS old_rows
+  FOR EACH STATEMENT
+  EXECUTE FUNCTION bump_documents_version();
+CREATE TRIGGER trigger_bump_documents_version_truncate
+  AFTER TRUNCATE ON public.documents
+  FOR EACH STATEMENT
+  EXECUTE FUNCTION bump_documents_version();
+
+ALTER TABLE public.documents_version ENABLE ROW LEVEL SECURITY;
+CREATE POLICY "Documents version is readable by everyone" ON public.documents_version FOR SELECT USING (true);
@@ -0,0 +1,18 @@
+-- Rolling summary per conversation so prompts stay bounded.
+-- The compaction job (scripts/conversation_compaction.py) folds older turns
+-- into ai_conversations.summary and flags them as compacted, keeping the last
+-- N turns uncompacted; sendMessage loads the summary plus those messages.
+
+ALTER TABLE public.ai_conversations
+    ADD COLUMN IF NOT EXISTS summary text,
+    ADD COLUMN IF NOT EXISTS summary_message_count integer DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS summarized_until timestamptz;
+
+ALTER TABLE public.ai_messages
+    ADD COLUMN IF NOT EXISTS compacted boolean DEFAULT false;
+
+CREATE INDEX IF NOT EXISTS idx_ai_messages_conversation_window
+    ON public.ai_messages(conversation_id, created_at DESC)
+    WHERE compacted = false;
+
+CREATE POLICY "Service role can compact messages" ON public.ai_messages FOR UPDATE TO service_role USING (true) WITH CHECK (true);
@@ -0,0 +1,66 @@
+-- Keyset-paginated community feed.
+-- Topics carry denormalized reply_count / last_activity_at so the feed no
+-- longer needs the embedded community_replies(count) aggregate, and feed pages
+-- are served from an index on (city_id, created_at, id) regardless of size.
+
+ALTER TABLE public.community_topics
+    ADD COLUMN IF NOT EXISTS last_activity_at timestamptz;
+
+-- Recount every topic: the old trigger did not fire on DELETE, so topics whose
+-- replies were all hard-deleted still carry stale counts and must go to 0.
+UPDATE public.community_topics t
+SET reply_count = COALESCE(r.reply_count, 0),
+    last_activity_at = GREATEST(t.created_at, r.last_reply_at)
+FROM public.community_topics t2
+LEFT JOIN (
+    SELECT topic_id, COUNT(*) AS reply_count, MAX(created_at) AS last_reply_at
+    FROM public.community_replies
+    WHERE NOT is_deleted AND deleted_at IS NULL
+    GROUP BY topic_id
+) r ON r.topic_id = t2.id
+WHERE t2.id = t.id;
+
+UPDATE public.community_topics SET last_activity_at = created_at WHERE last_activity_at IS NULL;
+ALTER TABLE public.community_topics ALTER COLUMN last_activity_at SET DEFAULT now();
+
+CREATE INDEX IF NOT EXISTS idx_community_topics_feed
+    ON public.community_topics(city_id, created_at DESC, id DESC)
+    WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_community_topics_feed_module
+    ON public.community_topics(city_id, module_id, created_at DESC, id DESC)
+    WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_community_replies_topic_created
+    ON public.community_replies(topic_id, created_at, id);
+
+-- Keep last_activity_at current alongside reply_count, and cover DELETE,
+-- which the original trigger definition did not fire on.
+CREATE OR REPLACE FUNCTION update_topic_reply_count()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public, pg_temp
+AS $$
+BEGIN
+  IF TG_OP = 'INSERT' AND NOT NEW.is_deleted THEN
+    UPDATE community_topics
+    SET reply_count = reply_count + 1,
+        last_activity_at = GREATEST(COALESCE(last_activity_at, NEW.created_at), NEW.created_at)
+    WHERE id = NEW.topic_id;
+  ELSIF TG_OP = 'UPDATE' THEN
+    IF OLD.is_deleted = FALSE AND NEW.is_deleted = TRUE THEN
+      UPDATE community_topics SET reply_count = GREATEST(reply_count - 1, 0) WHERE id = NEW.topic_id;
+    ELSIF OLD.is_deleted = TRUE AND NEW.is_deleted = FALSE THEN
+      UPDATE community_topics SET reply_count = reply_count + 1 WHERE id = NEW.topic_id;
+    END IF;
+  ELSIF TG_OP = 'DELETE' AND NOT OLD.is_deleted THEN
+    UPDATE community_topics SET reply_count = GREATEST(reply_count - 1, 0) WHERE id = OLD.topic_id;
+  END IF;
+  RETURN COALESCE(NEW, OLD);
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trigger_update_reply_count ON public.community_replies;
+CREATE TRIGGER trigger_update_reply_count
+  AFTER INSERT OR UPDATE OR DELETE ON public.community_replies
+  FOR EACH ROW
+  EXECUTE FUNCTION update_topic_reply_count();
@@ -0,0 +1,118 @@
+-- Time-partitioned audit_logs.
+-- audit_logs becomes a monthly RANGE-partitioned table so the retention job
+-- (scripts/audit_ingest.py retention) can drop whole months instead of
+-- running large DELETEs, and idx_audit_logs_user_id stays per-partition small.
+-- Batched inserts from the audit spool use ON CONFLICT (id, created_at) DO
+-- NOTHING, which makes spool replay after a restart idempotent.
+
+ALTER TABLE public.audit_logs RENAME TO audit_logs_legacy;
+ALTER INDEX IF EXISTS idx_audit_logs_user_id RENAME TO idx_audit_logs_legacy_user_id;
+ALTER INDEX IF EXISTS idx_audit_logs_event_type RENAME TO idx_audit_logs_legacy_event_type;
+
+CREATE TABLE public.audit_logs (
+    id uuid NOT NULL DEFAULT gen_random_uuid(),
+    user_id uuid,
+    event_type text NOT NULL,
+    payload_json jsonb,
+    created_at timestamptz NOT NULL DEFAULT now(),
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+CREATE INDEX idx_audit_logs_user_id ON public.audit_logs(user_id);
+CREATE INDEX idx_audit_logs_event_type ON public.audit_logs(event_type);
+
+CREATE TABLE public.audit_logs_default PARTITION OF public.audit_logs DEFAULT;
+
+-- Create monthly partitions from `from_month` (or the oldest month parked in
+-- audit_logs_default, if earlier) through `months_ahead` months from now.
+-- Postgres refuses to create a partition while the default partition holds
+-- rows in its range, so those rows are moved into a detached table first and
+-- it is then attached. Called by the audit writer on start and whenever a
+-- batch reaches past the covered months, and by the retention job.
+CREATE OR REPLACE FUNCTION ensure_audit_logs_partitions(from_month date DEFAULT date_trunc('month', now())::date, months_ahead int DEFAULT 3)
+RETURNS int
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  month_start date := date_trunc('month', LEAST(from_month, (SELECT min(created_at) FROM audit_logs_default)::date))::date;
+  last_month date := (date_trunc('month', now()) + make_interval(months => months_ahead))::date;
+  month_end date;
+  partition_name text;
+  created int := 0;
+BEGIN
+  WHILE month_start <= last_month LOOP
+    partition_name := 'audit_logs_' || to_char(month_start, 'YYYY_MM');
+    month_end := (month_start + interval '1 month')::date;
+    IF to_regclass('public.' || partition_name) IS NULL THEN
+      EXECUTE format(
+        'CREATE TABLE public.%I (LIKE public.audit_logs INCLUDING DEFAULTS INCLUDING CONSTRAINTS)',
+        partition_name
+      );
+      EXECUTE format(
+        'WITH moved AS (DELETE FROM public.audit_logs_default WHERE created_at >= %L AND created_at < %L RETURNING *)
+         INSERT INTO public.%I SELECT * FROM moved',
+        month_start, month_end, partition_name
+      );
+      EXECUTE format(
+        'ALTER TABLE public.audit_logs ATTACH PARTITION public.%I FOR VALUES FROM (%L) TO (%L)',
+        partition_name, month_start, month_end
+      );
+      created := created + 1;
+    END IF;
+    month_start := month_end;
+  END LOOP;
+  RETURN created;
+END;
+$$;
+
+-- Drop monthly partitions that end on or before `cutoff`
+CREATE OR REPLACE FUNCTION drop_audit_logs_partitions_before(cutoff timestamptz)
+RETURNS int
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  part record;
+  dropped int := 0;
+BEGIN
+  FOR part IN
+    SELECT c.relname
+    FROM pg_inherits i
+    JOIN pg_class c ON c.oid = i.inhrelid
+    JOIN pg_class p ON p.oid = i.inhparent
+    WHERE p.relname = 'audit_logs' AND c.relname ~ '^audit_logs_\d{4}_\d{2}$'
+  LOOP
+    IF (to_date(substring(part.relname from '\d{4}_\d{2}$'), 'YYYY_MM') + interval '1 month') <= cutoff THEN
+      EXECUTE format('DROP TABLE public.%I', part.relname);
+      dropped := dropped + 1;
+    END IF;
+  END LOOP;
+  RETURN dropped;
+END;
+$$;
+
+SELECT ensure_audit_logs_partitions(
+  COALESCE((SELECT min(created_at) FROM public.audit_logs_legacy), now())::date
+);
+
+INSERT INTO public.audit_logs (id, user_id, event_type, payload_json, created_at)
+SELECT id, user_id, event_type, payload_json, COALESCE(created_at, now())
+FROM public.audit_logs_legacy;
+
+DROP TABLE public.audit_logs_legacy;
+
+ALTER TABLE public.audit_logs ENABLE ROW LEVEL SECURITY;
+CREATE POLICY "Users can read own audit logs" ON public.audit_logs FOR SELECT TO authenticated USING (user_id = (select auth.uid()));
+CREATE POLICY "Users can insert their own audit logs" ON public.audit_logs FOR INSERT TO authenticated WITH CHECK (auth.uid() = user_id);
+CREATE POLICY "Service role can manage audit logs" ON public.audit_logs FOR ALL TO service_role USING (true) WITH CHECK (true);
+
+GRANT ALL ON public.audit_logs TO postgres, anon, authenticated, service_role;
+
+-- Partition maintenance runs DDL as the definer: only the service role may call it
+REVOKE EXECUTE ON FUNCTION ensure_audit_logs_partitions(date, int) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION drop_audit_logs_partitions_before(timestamptz) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION ensure_audit_logs_partitions(date, int) TO service_role;
+GRANT EXECUTE ON FUNCTION drop_audit_logs_partitions_before(timestamptz) TO service_role;
@@ -0,0 +1,61 @@
+-- Content-addressed document storage.
+-- Each unique upload is stored once in the documents bucket under
+-- blobs/<aa>/<sha256> and described by a document_blobs row; documents rows
+-- become per-user references to it via content_sha256. ref_count is kept by
+-- trigger, and blobs whose count drops to zero are stamped with orphaned_at
+-- so scripts/document_store.py gc can remove the object after a grace period.
+-- Rows with content_sha256 IS NULL are legacy per-user uploads that
+-- scripts/document_store.py dedupe folds into the blob store.
+
+CREATE TABLE IF NOT EXISTS public.document_blobs (
+    sha256 text PRIMARY KEY CHECK (sha256 ~ '^[0-9a-f]{64}$'),
+    storage_key text NOT NULL UNIQUE,
+    size bigint NOT NULL,
+    mime_type text NOT NULL,
+    ref_count integer NOT NULL DEFAULT 0 CHECK (ref_count >= 0),
+    created_at timestamptz DEFAULT now(),
+    orphaned_at timestamptz
+);
+
+ALTER TABLE public.documents
+    ADD COLUMN IF NOT EXISTS content_sha256 text REFERENCES public.document_blobs(sha256);
+
+CREATE INDEX IF NOT EXISTS idx_documents_user_content_sha256
+    ON public.documents(user_id, content_sha256) WHERE content_sha256 IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_documents_legacy_storage
+    ON public.documents(id) WHERE content_sha256 IS NULL AND user_id IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_document_blobs_orphaned
+    ON public.document_blobs(orphaned_at) WHERE ref_count = 0;
+
+CREATE OR REPLACE FUNCTION adjust_document_blob_refs()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.content_sha256 IS NOT NULL THEN
+    UPDATE public.document_blobs
+    SET ref_count = ref_count - 1,
+        orphaned_at = CASE WHEN ref_count - 1 = 0 THEN now() ELSE orphaned_at END
+    WHERE sha256 = OLD.content_sha256;
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.content_sha256 IS NOT NULL THEN
+    UPDATE public.document_blobs
+    SET ref_count = ref_count + 1, orphaned_at = NULL
+    WHERE sha256 = NEW.content_sha256;
+  END IF;
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS documents_blob_refs ON public.documents;
+CREATE TRIGGER documents_blob_refs
+AFTER INSERT OR DELETE OR UPDATE OF content_sha256 ON public.documents
+FOR EACH ROW EXECUTE FUNCTION adjust_document_blob_refs();
+
+-- Blob rows are managed server-side only; clients reach content through their own documents rows
+ALTER TABLE public.document_blobs ENABLE ROW LEVEL SECURITY;
+CREATE POLICY "Service role can manage document blobs" ON public.document_blobs FOR ALL TO service_role USING (true) WITH CHECK (true);
+
+GRANT ALL ON public.document_blobs TO postgres, service_role;
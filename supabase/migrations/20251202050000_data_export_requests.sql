@@ -0,0 +1,39 @@
+-- Per-user data export (GDPR / account deletion).
+-- scripts/data_export.py walks every user-owned table with keyset
+-- pagination on (owner, id); these composite indexes keep each page an index
+-- range scan no matter how much history a user has. ai_messages are paged per
+-- conversation (conversation_id, id) after walking the user's conversations.
+-- export_requests is the queue bulk workers claim from with FOR UPDATE SKIP LOCKED.
+
+CREATE INDEX IF NOT EXISTS idx_user_tasks_user_id_id ON public.user_tasks(user_id, id);
+CREATE INDEX IF NOT EXISTS idx_user_subtasks_user_id_id ON public.user_subtasks(user_id, id);
+CREATE INDEX IF NOT EXISTS idx_notes_user_id_id ON public.notes(user_id, id);
+CREATE INDEX IF NOT EXISTS idx_documents_user_id_id ON public.documents(user_id, id);
+CREATE INDEX IF NOT EXISTS idx_user_task_documents_user_id_id ON public.user_task_documents(user_id, id);
+CREATE INDEX IF NOT EXISTS idx_user_points_user_id_id ON public.user_points(user_id, id);
+CREATE INDEX IF NOT EXISTS idx_ai_conversations_user_id_id ON public.ai_conversations(user_id, id);
+CREATE INDEX IF NOT EXISTS idx_ai_messages_conversation_id_id ON public.ai_messages(conversation_id, id);
+CREATE INDEX IF NOT EXISTS idx_community_topics_created_by_id ON public.community_topics(created_by, id);
+CREATE INDEX IF NOT EXISTS idx_community_replies_created_by_id ON public.community_replies(created_by, id);
+CREATE INDEX IF NOT EXISTS idx_community_messages_created_by_id ON public.community_messages(created_by, id);
+CREATE INDEX IF NOT EXISTS idx_community_reports_reporter_id_id ON public.community_reports(reporter_id, id);
+CREATE INDEX IF NOT EXISTS idx_audit_logs_user_id_id ON public.audit_logs(user_id, id);
+
+CREATE TABLE IF NOT EXISTS public.export_requests (
+    id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+    user_id uuid NOT NULL REFERENCES auth.users(id) ON DELETE CASCADE,
+    status text NOT NULL DEFAULT 'pending' CHECK (status IN ('pending', 'running', 'done', 'failed')),
+    requested_at timestamptz NOT NULL DEFAULT now(),
+    started_at timestamptz,
+    finished_at timestamptz,
+    archive_path text,
+    error text
+);
+CREATE INDEX IF NOT EXISTS idx_export_requests_pending ON public.export_requests(requested_at) WHERE status = 'pending';
+
+ALTER TABLE public.export_requests ENABLE ROW LEVEL SECURITY;
+CREATE POLICY "Users can view own export requests" ON public.export_requests FOR SELECT TO authenticated USING ((SELECT auth.uid()) = user_id);
+CREATE POLICY "Users can request own export" ON public.export_requests FOR INSERT TO authenticated WITH CHECK ((SELECT auth.uid()) = user_id AND status = 'pending');
+CREATE POLICY "Service role can manage export requests" ON public.export_requests FOR ALL TO service_role USING (true) WITH CHECK (true);
+
+GRANT ALL ON public.export_requests TO postgres, authenticated, service_role;
@@ -0,0 +1,19 @@
+-- Reminder dispatcher bookkeeping.
+-- scripts/reminder_dispatcher.py records every delivered reminder here under
+-- '<kind>:<source id>:<lead seconds>:<deadline>' and skips keys already present,
+-- so restarting the dispatcher does not resend reminders. A rescheduled note or
+-- event has a new deadline and therefore new keys.
+-- The dispatcher pages events by (start_time, id); notes already have
+-- idx_notes_event_date.
+
+CREATE TABLE IF NOT EXISTS public.reminder_deliveries (
+    reminder_key text PRIMARY KEY,
+    sent_at timestamptz NOT NULL DEFAULT now()
+);
+
+ALTER TABLE public.reminder_deliveries ENABLE ROW LEVEL SECURITY;
+CREATE POLICY "Service role can manage reminder deliveries" ON public.reminder_deliveries FOR ALL TO service_role USING (true) WITH CHECK (true);
+
+GRANT ALL ON public.reminder_deliveries TO postgres, service_role;
+
+CREATE INDEX IF NOT EXISTS idx_events_start_time_id ON public.events(start_time, id);